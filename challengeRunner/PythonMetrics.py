@@ -1,119 +1,157 @@
 import json
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class CategoryStats:
+    """Aggregated stats for a single challenge category."""
+    # Written out instead of @dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("total_time", "total_cost", "count", "solved", "failed", "exit_reasons",
+                 "longest_name", "longest_time", "priciest_name", "priciest_cost", "unsolved")
+
+    def __init__(self, total_time=0, total_cost=0, count=0, solved=0, failed=0, exit_reasons=None,
+                 longest_name="", longest_time=0, priciest_name="", priciest_cost=0, unsolved=0):
+        self.total_time = total_time
+        self.total_cost = total_cost
+        self.count = count
+        self.solved = solved
+        self.failed = failed
+        self.exit_reasons = Counter() if exit_reasons is None else exit_reasons
+        self.longest_name = longest_name
+        self.longest_time = longest_time
+        self.priciest_name = priciest_name
+        self.priciest_cost = priciest_cost
+        self.unsolved = unsolved
+
+
 exitReasonDictionary = {}
 categoryDictionary = {}
 categoryNameDictionary = {"rev": "reverse engineering", "for": "digital forensics", "msc": "miscellaneous", "cry": "cryptography", "pwn": "binary exploitation (pwn)", "web": "web server"}
-nameDictionary = {}
-seenChallenges = set()
-failedChallengeList = []
+# Deduplicated runs, stored as parallel lists indexed through nameIndex
+nameIndex = {}
+runNames = []
+runCategories = []
+runExitReasons = []
+runTimes = []
+runCosts = []
+failedChallengeSet = set() # Only membership and count are needed, order is not
 directoryPath = Path('logs_dcipher/jupyter/kali_generic/jupyter/default') 
 
+NEEDED_KEYS = ('exit_reason', 'time_taken', 'total_cost')
+STREAM_MIN_SIZE = 4096 # Below this, a full decode is cheaper than setting up the ijson parser
+
 regCount = 0      # Regular challenge counter
 failedCount = 0   # Failed challenge counter (errors)
 solvedCount = 0   # Solved challenge counter
 unsolvedCount = 0 # Unsolved challenge counter
 totalCount = 0    # Total unique challenges attempted
 
-def undo_entry(rCat, stored):
-    """Undo a previously processed entry's contribution to all counters."""
-    global regCount, solvedCount, failedCount, unsolvedCount
-
-    categoryDictionary[rCat][0] -= stored['time_taken']
-    categoryDictionary[rCat][1] -= stored['total_cost']
-    categoryDictionary[rCat][2] -= 1
-    categoryDictionary[rCat][3] -= 1 if stored['exit_reason'] == 'solved' else 0
-    categoryDictionary[rCat][4] -= 1 if stored['exit_reason'] != 'solved' else 0
-    categoryDictionary[rCat][5][stored['exit_reason']] -= 1
-    categoryDictionary[rCat][10] -= 1 if stored['exit_reason'] != 'solved' else 0
-
-    if stored['exit_reason'] == 'solved':
-        solvedCount -= 1
-    elif stored['exit_reason'] == 'error':
-        failedCount -= 1
-        unsolvedCount -= 1
-        failedChallengeList.remove(stored['rName'])
-    else:
-        unsolvedCount -= 1
-
-    if stored['exit_reason'] != 'error':
-        regCount -= 1
-
-for item in directoryPath.iterdir():
-    if item.is_file():
-        with open(item,'r') as rFile:
-            jFile = json.load(rFile)
-        rArray = rFile.name.split("-")
-        rArray.pop()
-        rCat = rArray[1]
-        rName = '-'.join(rArray).split("/")[-1]
+def load_log(path):
+    """
+    Read the fields needed for the metrics from a single JSON log file.
+    Large logs are streamed with ijson (when installed) and parsing stops as soon as
+    the needed top-level keys are seen, so the conversation traces are never built.
+    """
+    if ijson is not None and path.stat().st_size >= STREAM_MIN_SIZE:
+        needed = {}
+        with open(path, 'rb') as f:
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                if key in NEEDED_KEYS:
+                    needed[key] = value
+                    if len(needed) == len(NEEDED_KEYS):
+                        break
+        return needed
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+# Load every log and keep one run per challenge. A duplicate replaces the kept run
+# only when it is solved and the kept run is not; any other duplicate (new error,
+# both failed, kept run already solved) keeps the old run, so nothing is counted twice.
+# Reads are I/O bound, so overlap them across threads.
+paths = [item for item in directoryPath.iterdir() if item.is_file()]
+with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+    for item, jFile in zip(paths, executor.map(load_log, paths)):
+        # <year>-<category>-<name>-<timestamp>.json -> strip the timestamp
+        rName = item.name.rsplit("-", 1)[0]
+        rCat = rName.split("-", 2)[1]
 
         exit_reason = jFile['exit_reason']
 
-        if rName in nameDictionary:
-            stored = nameDictionary[rName]
-            old_exit_reason = stored['exit_reason']
-
-            # New is error -> always keep old, skip this one
+        index = nameIndex.get(rName)
+        if index is not None:
+            old_exit_reason = runExitReasons[index]
             if exit_reason == 'error':
                 print(f"Duplicate found (new is error, keeping old): {item}")
                 continue
-
-            # Both are failed (non-error) -> keep old, skip this one
             if exit_reason != 'solved' and old_exit_reason != 'solved':
                 print(f"Duplicate found (both failed, keeping old): {item}")
                 continue
-
-            # New is solved and old was failed -> undo old, fall through to process new
-            if exit_reason == 'solved' and old_exit_reason != 'solved':
-                print(f"Duplicate found (new is better, replacing old): {item}")
-                undo_entry(rCat, stored)
-                del nameDictionary[rName]
-
-        # Track unique challenges via a set that is never modified after being added to
-        if rName not in seenChallenges:
-            totalCount += 1
-            seenChallenges.add(rName)
-
-        # Increment counters for the current file
-        if exit_reason == 'solved':
-            solvedCount += 1
-        elif exit_reason == 'error':
-            failedChallengeList.append(rName)
-            failedCount += 1
-            unsolvedCount += 1
-        else:
-            unsolvedCount += 1
-
-        nameDictionary[rName] = {
-            'exit_reason': exit_reason,
-            'time_taken': jFile['time_taken'],
-            'total_cost': jFile['total_cost'],
-            'rName': rName
-        }
-
-        if not rCat in categoryDictionary:
-            categoryDictionary.update({rCat : [0, 0, 0, 0, 0, {}, "", 0, "", 0, 0]})
-            # Time, cost, amount of entries, solved, failed, exit reason dictionary, longest challenge, time, most expensive challenge, cost, unsolved
-
-        if not exit_reason in categoryDictionary[rCat][5]:
-            categoryDictionary[rCat][5].update({exit_reason : 0})
-
-        categoryDictionary[rCat][0] += jFile['time_taken']
-        categoryDictionary[rCat][1] += jFile['total_cost']
-        categoryDictionary[rCat][2] += 1
-        categoryDictionary[rCat][3] += 1 if exit_reason == 'solved' else 0
-        categoryDictionary[rCat][4] += 1 if exit_reason != 'solved' else 0
-        categoryDictionary[rCat][5][exit_reason] += 1
-        categoryDictionary[rCat][6] = rName if jFile['time_taken'] > categoryDictionary[rCat][7] else categoryDictionary[rCat][6]
-        categoryDictionary[rCat][7] = jFile['time_taken'] if jFile['time_taken'] > categoryDictionary[rCat][7] else categoryDictionary[rCat][7]
-        categoryDictionary[rCat][8] = rName if jFile['total_cost'] > categoryDictionary[rCat][9] else categoryDictionary[rCat][8]
-        categoryDictionary[rCat][9] = jFile['total_cost'] if jFile['total_cost'] > categoryDictionary[rCat][9] else categoryDictionary[rCat][9]
-        categoryDictionary[rCat][10] += 1 if exit_reason != 'solved' else 0
-
-        if exit_reason != 'error':
-            regCount += 1
+            if old_exit_reason == 'solved':
+                print(f"Duplicate found (old is solved, keeping old): {item}")
+                continue
+            print(f"Duplicate found (new is better, replacing old): {item}")
+            # Overwrite the old run in place, name and category are the same
+            runExitReasons[index] = exit_reason
+            runTimes[index] = jFile['time_taken']
+            runCosts[index] = jFile['total_cost']
+            continue
+
+        nameIndex[rName] = len(runNames)
+        runNames.append(rName)
+        runCategories.append(rCat)
+        runExitReasons.append(exit_reason)
+        runTimes.append(jFile['time_taken'])
+        runCosts.append(jFile['total_cost'])
+
+# Group the deduplicated runs by category, then reduce each group with
+# C-level builtins (sum/max/Counter) instead of updating stats row by row
+categoryRuns = {}
+for index, rCat in enumerate(runCategories):
+    categoryRuns.setdefault(rCat, []).append(index)
+
+totalCount = len(runNames)
+for rCat, indices in categoryRuns.items():
+    names = [runNames[i] for i in indices]
+    times = [runTimes[i] for i in indices]
+    costs = [runCosts[i] for i in indices]
+    reasons = Counter(runExitReasons[i] for i in indices)
+
+    stats = categoryDictionary[rCat] = CategoryStats(
+        total_time=sum(times),
+        total_cost=sum(costs),
+        count=len(indices),
+        solved=reasons['solved'],
+        exit_reasons=reasons,
+    )
+    stats.failed = stats.unsolved = stats.count - stats.solved
+    longest = max(range(stats.count), key=times.__getitem__)
+    if times[longest] > 0:
+        stats.longest_name, stats.longest_time = names[longest], times[longest]
+    priciest = max(range(stats.count), key=costs.__getitem__)
+    if costs[priciest] > 0:
+        stats.priciest_name, stats.priciest_cost = names[priciest], costs[priciest]
+
+    errors = reasons['error']
+    solvedCount += stats.solved
+    failedCount += errors
+    unsolvedCount += stats.unsolved
+    regCount += stats.count - errors
+    if errors:
+        failedChallengeSet.update(runNames[i] for i in indices if runExitReasons[i] == 'error')
 
 print(f"\nTOTAL COMPLETED CHALLENGES: {regCount}")
 print(f"Total unique attempted challenges (incl. errors): {totalCount}\n")
@@ -121,19 +159,23 @@ print(f"Solved: {solvedCount}, Errors (failed): {failedCount}")
 print(f"Unsolved: {unsolvedCount} ({((unsolvedCount/regCount)*100):.1f}% unsolved | {((solvedCount/regCount)*100):.1f}% solved)\n")
 
 for i, v in categoryDictionary.items():
-    averageRawTime = (v[0]/v[2])
+    count = v.count
+    solved = v.solved
+    errors = v.exit_reasons.get('error', 0)
+    averageRawTime = v.total_time/count
     averageMinutes = averageRawTime/60
     averageSeconds = averageRawTime%60
-    mostSeconds = v[7]%60
-    mostMinutes = (v[7]/60)%60
-    mostHours = (v[7]/60)/60
+    longestTime = v.longest_time
+    mostSeconds = longestTime%60
+    mostMinutes = (longestTime/60)%60
+    mostHours = (longestTime/60)/60
 
-    print(f"Stats for {categoryNameDictionary[i]} ({v[2]} challenges. Solved: {v[3]}, Unsolved: {v[10]} (Errors: {v[5].get('error', 0)}) | {((v[3]/v[2])*100):.1f}% solved):")
+    print(f"Stats for {categoryNameDictionary[i]} ({count} challenges. Solved: {solved}, Unsolved: {v.unsolved} (Errors: {errors}) | {((solved/count)*100):.1f}% solved):")
     print(f"\tAverage time taken: {averageMinutes:.1f} minutes and {averageSeconds:.1f} seconds | Raw: {averageRawTime:.3f}")
-    print(f"\tAverage total cost: ${(v[1])/(v[2]):.2f}")
-    print(f"\tLongest challenge: {v[6]} ({mostHours:.1f} hours {mostMinutes:.1f} minutes and {mostSeconds:.1f} seconds | Raw: {v[7]:.3f} seconds)")
-    print(f"\tMost expensive challenge: {v[8]} (${v[9]:.2f})")
-    print(f"\tSolve rate per dollar: {v[3]/v[1]:.2f}")
+    print(f"\tAverage total cost: ${v.total_cost/count:.2f}")
+    print(f"\tLongest challenge: {v.longest_name} ({mostHours:.1f} hours {mostMinutes:.1f} minutes and {mostSeconds:.1f} seconds | Raw: {longestTime:.3f} seconds)")
+    print(f"\tMost expensive challenge: {v.priciest_name} (${v.priciest_cost:.2f})")
+    print(f"\tSolve rate per dollar: {solved/v.total_cost:.2f}")
     print(f"\tExit reasons: ")
-    for k, j in v[5].items():
-        print(f"\t\t{k} -> {j}")
\ No newline at end of file
+    for k, j in v.exit_reasons.items():
+        print(f"\t\t{k} -> {j}")
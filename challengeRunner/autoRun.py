@@ -5,9 +5,10 @@ Deletes entries for completed challenges from input, and adds them to output fil
 
 import subprocess
 import os
+import re
 import sys
 import fcntl
-import filterFinishedChallenges
+from collections import deque
 
 #import configs
 try:
@@ -17,6 +18,10 @@ except ImportError as e:
     print(f"Details: {e}")
     sys.exit(1)
 
+# Status markers searched for in the dcipher output, matched in a single pass
+# Works on the raw output bytes so the tail never has to be decoded or lowercased as a whole
+_STATUS_RE = re.compile(rb"traceback \(most recent call last\)|keyerror|challenge solved", re.IGNORECASE)
+
 def append_to_finished(finished_file, challenge_name, output):
     """
     Append the challenge name to the finished challenges file with status.
@@ -24,27 +29,26 @@ def append_to_finished(finished_file, challenge_name, output):
     Args:
         finished_file: Path to the finished challenges file
         challenge_name: Challenge name to append
-        output: The output of d-cipher framework
+        output: The raw output (bytes) of d-cipher framework
     """
     # Also check the full output for errors
-    output = output.lower()
+    found = {match.lower() for match in _STATUS_RE.findall(output)}
     # Check for solved status
     status_parts = [challenge_name]
     #check for exceptions and improper split selection
-    if 'traceback (most recent call last)' in output or 'keyerror' in output:
+    if b'traceback (most recent call last)' in found or b'keyerror' in found:
         status_parts.append('FAILED')
         # Extract the error type
-        if 'keyerror' in output:
+        if b'keyerror' in found:
             status_parts.append('KEY_ERROR')
-        elif 'traceback (most recent call last)' in output:
+        else:
             status_parts.append('FAILED TO RUN')
-    elif 'challenge solved' in output:
+    elif b'challenge solved' in found:
         status_parts.append('SOLVED')
     else:
         status_parts.append('NOT_SOLVED')
     # append the last line of log info
-    lines = output.strip().split('\n')
-    last_line = lines[-1].strip()
+    last_line = output.rstrip().rpartition(b'\n')[2].strip().decode('utf-8', errors='replace').lower()
     if last_line:
         status_parts.append(last_line)
 
@@ -60,22 +64,22 @@ def append_to_finished(finished_file, challenge_name, output):
         fcntl.flock(f, fcntl.LOCK_UN)
     print(f"✓ Added to finished challenges: {status_line}", flush=True)
 
-def get_next_challenge(input_file):
+def get_next_challenge(input_fh):
     """
     Get the next challenge from the input file and claim it atomically.
 
     Args:
-        input_file: Path to the input file
+        input_fh: Open (r+) handle of the input file, kept for the whole session
     Returns:
         Challenge name or None if no unclaimed challenges remain
     """
     try:
-        with open(input_file, 'r+') as f:
-            #lock the file
-            fcntl.flock(f, fcntl.LOCK_EX)
-
-            # Read all lines
-            lines = f.readlines()
+        #lock the file only for the claim itself
+        fcntl.flock(input_fh, fcntl.LOCK_EX)
+        try:
+            # Read all lines, other workers may have changed the file since the last claim
+            input_fh.seek(0)
+            lines = input_fh.readlines()
 
             # Find the first unclaimed challenge
             challenge_name = None
@@ -88,48 +92,53 @@ def get_next_challenge(input_file):
                     break
             # If we found a challenge, write back the file with the claim marker
             if challenge_name is not None:
-                f.seek(0)
-                f.writelines(lines)
-                f.flush()
+                input_fh.seek(0)
+                input_fh.writelines(lines)
+                input_fh.flush()
                 print(f"✓ Claimed '{challenge_name}' from input file")
-
+        finally:
             # unlock the file
-            fcntl.flock(f, fcntl.LOCK_UN)
+            fcntl.flock(input_fh, fcntl.LOCK_UN)
         return challenge_name
 
     except Exception as e:
         print(f"⚠ Error reading from input file: {e}")
         return None
-def remove_from_input_file(input_file, challenge_name):
+def remove_from_input_file(input_fh, challenge_name):
     """
     Remove the challenge name from the input file.
 
     Args:
-        input_file: Path to the input file
+        input_fh: Open (r+) handle of the input file
         challenge_name: Challenge name to remove
     """
     try:
-        with open(input_file, 'r+') as f:
-            #lock file
-            fcntl.flock(f, fcntl.LOCK_EX)
-            lines = f.readlines()
+        #lock file
+        fcntl.flock(input_fh, fcntl.LOCK_EX)
+        try:
+            input_fh.seek(0)
+            lines = input_fh.readlines()
 
             #filter out challenge from inputfile
-            remaining_lines = [line for line in lines
-                               if not (line.strip() == challenge_name or
-                                       line.strip() == f"{challenge_name} CLAIMED")]
+            targets = {challenge_name, f"{challenge_name} CLAIMED"}
+            remaining_lines = [line for line in lines if line.strip() not in targets]
 
             # Write back the remaining challenges
-            f.seek(0)
-            f.writelines(remaining_lines)
-            f.truncate()
-            f.flush()
+            input_fh.seek(0)
+            input_fh.writelines(remaining_lines)
+            input_fh.truncate()
+            input_fh.flush()
+        finally:
             #unlock file
-            fcntl.flock(f, fcntl.LOCK_UN)
+            fcntl.flock(input_fh, fcntl.LOCK_UN)
         print(f"✓ Removed '{challenge_name}' from input file")
     except Exception as e:
         print(f"⚠ Warning: Could not remove '{challenge_name}' from input file: {e}")
 
+# Only the tail of the dcipher output is parsed for the finished file
+TAIL_LINES = 15
+READ_CHUNK = 65536
+
 def run_dcipher_command(challenge_name):
     """
     Run the dcipher command with the given challenge name.
@@ -138,7 +147,7 @@ def run_dcipher_command(challenge_name):
         challenge_name: The challenge to run
 
     Returns:
-        Tuple of (success: bool, output: str) where output contains the command output
+        List of the last TAIL_LINES lines (bytes) of the command output
     """
     cmd = [
         "uv", "run", os.path.expanduser("~/ctf-agents/run_dcipher.py"),
@@ -157,15 +166,22 @@ def run_dcipher_command(challenge_name):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,  # Line buffered
-            universal_newlines=True
+            bufsize=READ_CHUNK
         )
-        # Capture output while printing in real-time
-        output = []
-        for line in process.stdout:
-            print(line, end='')  # Print to console immediately
-            output.append(line)
+        # Print output in real-time, keeping only the tail of the log as raw bytes
+        sys.stdout.flush()
+        output = deque(maxlen=TAIL_LINES)
+        partial = b""
+        while chunk := process.stdout.read1(READ_CHUNK):
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            lines = (partial + chunk).splitlines(keepends=True)
+            # Hold back an unterminated last line until the rest of it arrives
+            partial = lines.pop() if lines and not lines[-1].endswith((b"\n", b"\r")) else b""
+            output.extend(lines)
+        if partial:
+            output.append(partial)
+        output = list(output)
         # Wait for process to complete
         return_code = process.wait()
         if return_code == 0:
@@ -176,7 +192,7 @@ def run_dcipher_command(challenge_name):
             return output
     except Exception as e:
         print(f"Command failed for {challenge_name}: {e}")
-        return ""
+        return []
 
 def main():
     # Check if input file exists
@@ -198,29 +214,29 @@ def main():
 
     #for each challenge run command and process files
     #TODO need to implement a time check to skip a challenge if it takes too long !!!!!!!!!!!!!!
-    while True:
-        # Get next unclaimed challenge and mark it as claimed atomically
-        # This prevents other processes from picking up the same challenge
-        challenge_name = get_next_challenge(input_file)
-
-        #get_next_challenge returns none if it cannot locate an unclaimed file
-        if challenge_name is None:
-            print("\nNo more challenges to process")
-            break
-
-        # Run the command
-        output = run_dcipher_command(challenge_name)
-        #extract only 15 lines
-        output = output[-15:]
-        #put back into a string instead of array so methods can parse properly
-        output = "".join(output)
-
-        #process the output
-        append_to_finished(finished_file, challenge_name, output)
-        remove_from_input_file(input_file, challenge_name)
-
-        print("Challenged completed.", flush=True)
-        print("-" * 60)
+    # Keep the input file open for the whole session, each finished challenge is removed as soon as it is done
+    with open(input_file, 'r+') as input_fh:
+        while True:
+            # Get next unclaimed challenge and mark it as claimed atomically
+            # This prevents other processes from picking up the same challenge
+            challenge_name = get_next_challenge(input_fh)
+
+            #get_next_challenge returns none if it cannot locate an unclaimed file
+            if challenge_name is None:
+                print("\nNo more challenges to process")
+                break
+
+            # Run the command
+            output = run_dcipher_command(challenge_name)
+            #put back into a string instead of array so methods can parse properly
+            output = b"".join(output)
+
+            #process the output
+            append_to_finished(finished_file, challenge_name, output)
+            remove_from_input_file(input_fh, challenge_name)
+
+            print("Challenged completed.", flush=True)
+            print("-" * 60)
 
     print("\n" + "=" * 60)
     print("Processing complete!")
@@ -18,7 +18,6 @@ def parseChallengeLog(inputFile, outputFile):
         inputFile: Path to the input log file
         outputFile: Path to the output file for filtered results
     """
-    challengeNames = set()  # Use set to avoid duplicates
     with open(inputFile, 'r') as f:
         # lock the file
         fcntl.flock(f, fcntl.LOCK_EX)
@@ -26,27 +25,19 @@ def parseChallengeLog(inputFile, outputFile):
         lines = [line.strip() for line in f if line.strip()]  # Read all non-empty lines
         # unlock the file
         fcntl.flock(f, fcntl.LOCK_UN)
+    # Collect failed and successful challenge names in a single pass
+    failedNames = set()
+    successfulNames = set()
     for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+        # Extract the challenge name (first part before the first " - ")
+        challengeName = line.split(" - ", 1)[0].strip()
         # Check if line contains "FAILED TO RUN" or "EXCEPTION"
         if "FAILED TO RUN" in line or "EXCEPTION" in line:
-            # Extract the challenge name (first part before the first " - ")
-            parts = line.split(" - ")
-            if parts:
-                challengeName = parts[0].strip()
-                challengeNames.add(challengeName)
-                #go back through file and check for another instance of same challenge
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    #if there is another instance of same challenge that doesn't have an error
-                    if challengeName in line and ("FAILED TO RUN" not in line and "EXCEPTION" not in line):
-                        challengeNames.remove(challengeName)
-                        #ensure you don't try to remove again (is a set will only have one instance)
-                        break
+            failedNames.add(challengeName)
+        else:
+            successfulNames.add(challengeName)
+    # Drop challenges that have another instance that ran without an error
+    challengeNames = failedNames - successfulNames
     #check if no failed challenges were found
     if(len(challengeNames) == 0):
         print("No challenges left to be ran")
@@ -1,31 +1,74 @@
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import cache
+from importlib import import_module
 from pathlib import Path
+import os
+import pickle
 import yaml
 
-from .openai_backend import OpenAIBackend
-from .anthropic_backend import AnthropicBackend
-from .together_backend import TogetherBackend
-from .gemini_backend import GeminiBackend
-from .ollama_backend import OllamaBackend
-from .vertexai_backend import VertexAIBackend
-from .openrouter_backend import OpenRouterBackend
 from .backend import Role
 
-# Map backend names to their classes
+# Map backend names to the module and class implementing them.
+# Backend modules pull in their (heavy) provider SDKs, so they are only
+# imported once a model served by them is actually selected.
 BACKEND_CLASSES = {
-    'openai': OpenAIBackend,
-    'anthropic': AnthropicBackend,
-    'gemini': GeminiBackend,
-    'vertexai': VertexAIBackend,
-    'ollama': OllamaBackend,
-    'openrouter': OpenRouterBackend,
-    'together': TogetherBackend,
+    'openai': ('.openai_backend', 'OpenAIBackend'),
+    'anthropic': ('.anthropic_backend', 'AnthropicBackend'),
+    'gemini': ('.gemini_backend', 'GeminiBackend'),
+    'vertexai': ('.vertexai_backend', 'VertexAIBackend'),
+    'ollama': ('.ollama_backend', 'OllamaBackend'),
+    'openrouter': ('.openrouter_backend', 'OpenRouterBackend'),
+    'together': ('.together_backend', 'TogetherBackend'),
 }
 
+@cache
+def load_backend(backend):
+    """Import and return the Backend class for a backend name"""
+    module, cls = BACKEND_CLASSES[backend]
+    return getattr(import_module(module, __name__), cls)
+
+class LazyModels(Mapping):
+    """Model name -> Backend class, importing the backend module on first lookup"""
+    def __init__(self, models_config):
+        self._backends = {name: info['backend'] for name, info in models_config.items()}
+
+    def __getitem__(self, model):
+        return load_backend(self._backends[model])
+
+    def __contains__(self, model):
+        return model in self._backends
+
+    def __iter__(self):
+        return iter(self._backends)
+
+    def __len__(self):
+        return len(self._backends)
+
 def load_models_config():
-    """Load model definitions from models.yaml"""
+    """
+    Load model definitions from models.yaml.
+    The parsed config is cached in a pickle next to it and reused until models.yaml changes.
+    """
     models_path = Path(__file__).parent / 'models.yaml'
+    cache_path = models_path.with_suffix('.pkl')
+    try:
+        if cache_path.stat().st_mtime >= models_path.stat().st_mtime:
+            return pickle.loads(cache_path.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     with open(models_path) as f:
-        return yaml.safe_load(f)
+        models_config = yaml.load(f, Loader=loader)
+    try:
+        # Write then rename, so parallel runs never read a partial pickle
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(pickle.dumps(models_config, protocol=5))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass # Read-only install, parse every time
+    return models_config
 
 # Load models configuration at module import time
 _models_config = load_models_config()
@@ -39,11 +82,23 @@ MODEL_INFO = {
 
 # MODELS: model name -> Backend class
 # Used to select the correct backend for a given model
-MODELS = {
-    name: BACKEND_CLASSES[info['backend']]
-    for name, info in _models_config.items()
-}
+MODELS = LazyModels(_models_config)
+
+# MODELS_BY_BACKEND: backend name -> tuple of model names served by that backend
+# Used to list the available models when a lookup fails
+_models_by_backend = defaultdict(list)
+for name, info in _models_config.items():
+    _models_by_backend[info['backend']].append(name)
+MODELS_BY_BACKEND = {backend: tuple(names) for backend, names in _models_by_backend.items()}
+
+_BACKEND_BY_CLASS = {cls: backend for backend, (_, cls) in BACKEND_CLASSES.items()}
 
-# For backwards compatibility, also export the list of backend classes
-BACKENDS = list(BACKEND_CLASSES.values())
+def __getattr__(name):
+    # For backwards compatibility, also export the backend classes and their list,
+    # resolved lazily on first access
+    if name == 'BACKENDS':
+        return [load_backend(backend) for backend in BACKEND_CLASSES]
+    if name in _BACKEND_BY_CLASS:
+        return load_backend(_BACKEND_BY_CLASS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -0,0 +1,29 @@
+"""
+Process-wide HTTP client shared by the backends.
+Every agent role creates its own SDK client, sharing one httpx pool keeps
+connections to the provider warm across roles instead of handshaking per client.
+"""
+import atexit
+
+import httpx
+
+try:
+    import h2 # HTTP/2 support is optional in httpx
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# Parallel agents burst requests to the same host, keep enough idle connections warm for them
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=90.0)
+# Match the OpenAI SDK default read timeout, reasoning models can take minutes to respond
+TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_shared_client = None
+
+def shared_http_client():
+    """Return the shared httpx.Client, created on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = httpx.Client(limits=LIMITS, timeout=TIMEOUT, http2=HTTP2, follow_redirects=True)
+        atexit.register(_shared_client.close)
+    return _shared_client
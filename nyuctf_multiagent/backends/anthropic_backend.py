@@ -1,5 +1,5 @@
-import json
-from anthropic import Anthropic, RateLimitError
+import backoff
+from anthropic import Anthropic, RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
 
 from ..conversation import MessageRole
 from ..tools import ToolCall, ToolResult
@@ -7,14 +7,61 @@ from ..tools import ToolCall, ToolResult
 
 from .backend import Backend, BackendResponse
 
+# Transient errors are retried with jittered exponential backoff; 5xx responses raise InternalServerError.
+# This is the only retry layer, the client is created with the SDK's own retries disabled
+RETRY_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+retry_transient = backoff.on_exception(backoff.expo, RETRY_ERRORS, max_tries=6, jitter=backoff.full_jitter)
+
+def _format_observation(m):
+    return {"role": "user",
+            "content": [{
+                "type": "tool_result",
+                "tool_use_id": m.tool_data.id,
+                "content": m.tool_data.to_json()
+             }]}
+
+def _format_assistant(m):
+    msg = {"role": m.role.value, "content": []}
+    if m.content is not None:
+        msg["content"].append({"type": "text", "text": m.content})
+    if m.tool_data is not None:
+        msg["content"].append({"type": "tool_use",
+                               "id": m.tool_data.id,
+                               "name": m.tool_data.name,
+                               "input": m.tool_data.arguments})
+    return msg
+
+def _format_text(m):
+    return {"role": m.role.value, "content": [{"type": "text", "text": m.content}]}
+
+# Dispatch on the message role, user messages are plain text
+_FORMATTERS = {
+    MessageRole.OBSERVATION: _format_observation,
+    MessageRole.ASSISTANT: _format_assistant,
+}
+
+def _format_message(m):
+    return _FORMATTERS.get(m.role, _format_text)(m)
+
+# Prompt caching: cache reads are billed at 10% of the input price, writes at 125%
+EPHEMERAL = {"type": "ephemeral"}
+CACHE_READ_FACTOR = 0.1
+CACHE_WRITE_FACTOR = 1.25
+
+def _with_cache_breakpoint(msg):
+    """Copy of msg with a cache breakpoint on its last content block, the memoized format is left untouched"""
+    *blocks, last = msg["content"]
+    return {**msg, "content": [*blocks, {**last, "cache_control": EPHEMERAL}]}
+
 class AnthropicBackend(Backend):
     NAME = "anthropic"
     # Models are now defined in models.yaml
+    CAUGHT_ERRORS = (RateLimitError,)
 
     def __init__(self, role, model, tools, api_key, config):
         super().__init__(role, model, tools, config)
-        self.client = Anthropic(api_key=api_key)
-        self.tool_schemas = [self.get_tool_schema(tool) for tool in tools.values()]
+        self.client = Anthropic(api_key=api_key, max_retries=0)
+        self.tool_schemas = self._tool_schemas("schemas", self.get_tool_schema)
 
     @staticmethod
     def get_tool_schema(tool):
@@ -22,61 +69,57 @@ class AnthropicBackend(Backend):
         return {
             "name": tool.NAME,
             "description": tool.DESCRIPTION,
-            "input_schema": {
-                "type": "object",
-                "properties": {n: {"type": p[0], "description": p[1]} for n, p in tool.PARAMETERS.items()},
-                "required": list(tool.REQUIRED_PARAMETERS),
-            }
+            "input_schema": tool.parameters_schema()
         }
 
     def calculate_cost(self, response):
         if response.usage:
             input_tokens = response.usage.input_tokens or 0
             output_tokens = response.usage.output_tokens or 0
-            return self.in_price * input_tokens + self.out_price * output_tokens
+            # Cached prompt tokens are reported separately from input_tokens
+            cache_write_tokens = getattr(response.usage, "cache_creation_input_tokens", None) or 0
+            cache_read_tokens = getattr(response.usage, "cache_read_input_tokens", None) or 0
+            return self.in_price * (input_tokens + CACHE_WRITE_FACTOR * cache_write_tokens
+                                    + CACHE_READ_FACTOR * cache_read_tokens) \
+                    + self.out_price * output_tokens
         return 0
 
-    def _call_model(self, system, messages):
-        return self.client.messages.create(
+    def _request_params(self, system, messages):
+        if self.prompt_cache:
+            # Tools and system come first in the prompt, one breakpoint after the system caches both.
+            # The breakpoint on the last message lets the next turn read the whole history from the cache.
+            if system:
+                system = [{"type": "text", "text": system, "cache_control": EPHEMERAL}]
+            if messages and messages[-1]["content"]:
+                messages = [*messages[:-1], _with_cache_breakpoint(messages[-1])]
+        params = dict(
                 model=self.model,
                 max_tokens=self.get_param(self.role, "max_tokens"),
                 temperature=self.get_param(self.role, "temperature"),
-                system=system,
-                tools=self.tool_schemas,
                 messages=messages)
+        if system:
+            params["system"] = system
+        if self._has_tools:
+            params["tools"] = self.tool_schemas
+        return params
 
-    def send(self, messages):
-        formatted_messages = []
+    @retry_transient
+    def _call_model(self, request):
+        return self.client.messages.create(**self._request_params(*request))
+
+    def _format_messages(self, messages):
         system = None
+        conversation = []
+        append = conversation.append
         for m in messages:
-            if m.role == MessageRole.SYSTEM:
+            if m.role is MessageRole.SYSTEM:
                 system = m.content
-                continue
-            if m.role == MessageRole.OBSERVATION:
-                msg = {"role": "user",
-                       "content": [{
-                           "type": "tool_result",
-                           "tool_use_id": m.tool_data.id,
-                           "content": json.dumps(m.tool_data.result)
-                        }]}
-            elif m.role == MessageRole.ASSISTANT:
-                msg = {"role": m.role.value, "content": []}
-                if m.content is not None:
-                    msg["content"].append({"type": "text", "text": m.content})
-                if m.tool_data is not None:
-                    msg["content"].append({"type": "tool_use",
-                                           "id": m.tool_data.id,
-                                           "name": m.tool_data.name,
-                                           "input": m.tool_data.arguments})
             else:
-                msg = {"role": m.role.value, "content": [{"type": "text", "text": m.content}]}
-            formatted_messages.append(msg)
+                append(m)
+        return system, self._format_each(conversation, _format_message)
 
-        try:
-            response = self._call_model(system, formatted_messages)
-            cost = self.calculate_cost(response)
-        except RateLimitError as e:
-            return BackendResponse(error=f"Backend Error: {e}")
+    def _parse_response(self, response):
+        cost = self.calculate_cost(response)
 
         # Guard against None content (blocked/empty responses)
         if not response.content:
@@ -97,3 +140,4 @@ class AnthropicBackend(Backend):
             tool_call = None
 
         return BackendResponse(content=content, tool_call=tool_call, cost=cost)
+
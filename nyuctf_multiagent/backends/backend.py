@@ -1,8 +1,26 @@
-import json
 from dataclasses import dataclass
 from enum import Enum
 
+from .. import jsonutils
 from ..tools import ToolResult
+from .response_cache import get_response_cache, make_key
+
+# Bound lazily on first use, the package imports this module before these exist
+_MODEL_INFO = None
+_MODELS_BY_BACKEND = None
+
+def _model_info():
+    global _MODEL_INFO, _MODELS_BY_BACKEND
+    if _MODEL_INFO is None:
+        from . import MODEL_INFO, MODELS_BY_BACKEND
+        _MODEL_INFO = MODEL_INFO
+        _MODELS_BY_BACKEND = MODELS_BY_BACKEND
+    return _MODEL_INFO
+
+# Tool schemas only depend on the tool classes, so backends of the same class and toolset share them
+_TOOLSET_CACHE = {}
+# Single tool schemas, shared between the different toolsets of the roles (e.g. run_command)
+_TOOL_SCHEMA_CACHE = {}
 
 class Role(Enum):
     PLANNER = "planner"
@@ -26,29 +44,182 @@ class BackendResponse:
 class Backend:
     """Base class for LLM Backend"""
     NAME = "base"  # Set the backend name in subclass
+    # Errors turned into an error response instead of raising
+    CAUGHT_ERRORS = ()
 
     def __init__(self, role: Role, model, tools, config):
-        # Import MODEL_INFO here to avoid circular imports
-        from . import MODEL_INFO
-        
+        MODEL_INFO = _model_info()
+
         if self.NAME == "base":
             raise NotImplementedError("Backend name not set, initialize NAME in the subclass")
         
         if model not in MODEL_INFO:
             # List models available for this backend
-            available = [m for m, info in MODEL_INFO.items() 
-                        if info.get('backend', self.NAME) == self.NAME or m in getattr(self.__class__, 'MODELS', {})]
+            available = _MODELS_BY_BACKEND.get(self.NAME, ())
             raise KeyError(f"Model {model} not found in models.yaml.\n" + \
                           f"Available models for {self.NAME}: {', '.join(available[:10])}{'...' if len(available) > 10 else ''}")
         
         model_info = MODEL_INFO[model]
+        experiment = getattr(config, "experiment", None)
+        if experiment is not None and experiment.strict_prefix:
+            # Tool schemas precede the messages in the prompt, a fixed order keeps that prefix byte-identical
+            tools = dict(sorted(tools.items()))
         self.role = role
         self.model = model
         self.tools = tools
+        self._has_tools = bool(tools) # Roles without tools leave the tool parameters out of requests
         self.config = config
         # Explicitly convert to float in case YAML parsed as string
         self.in_price = float(model_info["cost_per_input_token"])
         self.out_price = float(model_info["cost_per_output_token"])
+        # Sampled completions are not reproducible, so only deterministic roles are cached by default
+        cacheable = experiment is not None and \
+                (experiment.cache_sampled or not self.get_param(role, "temperature"))
+        if cacheable and experiment.cache_enabled:
+            self.cache = get_response_cache(experiment.cache_ttl, experiment.cache_path)
+        else:
+            self.cache = None
+        if cacheable and experiment.semantic_cache:
+            from .semantic_cache import get_semantic_cache
+            self.semantic_cache = get_semantic_cache(experiment.semantic_threshold)
+        else:
+            self.semantic_cache = None
+        self.stream = experiment is not None and experiment.stream
+        self.prompt_cache = experiment is not None and experiment.prompt_cache
+        self._format_memo = {}
+        self._format_prefix = ([], []) # (messages, formatted) of the previous call
+        self._schema_digest = None # Digest of the tool schemas sent with every request
+        self._cache_scope = None
+
+    def send(self, messages):
+        request = self._format_messages(messages)
+        key, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        try:
+            response = self._call_model(request)
+        except self.CAUGHT_ERRORS as e:
+            return self.error_response(e)
+        return self._cache_store(key, self._parse_response(response))
+
+    def _format_messages(self, messages):
+        """Convert the conversation messages into the request sent by _call_model"""
+        raise NotImplementedError
+
+    def _call_model(self, request):
+        """Send the formatted request to the provider, returns the raw response"""
+        raise NotImplementedError
+
+    def _parse_response(self, response):
+        """Convert the raw provider response into a BackendResponse"""
+        raise NotImplementedError
+
+    def error_response(self, error):
+        """Error response for one of CAUGHT_ERRORS"""
+        return BackendResponse(error=f"Backend Error: {error}")
+
+    def _toolset_cached(self, name, factory):
+        """
+        Return factory() for this backend class and toolset, built once and shared between
+        instances (e.g. the tool schemas of every agent role). The result must not be mutated.
+        """
+        key = (type(self), name, tuple(type(tool) for tool in self.tools.values()))
+        value = _TOOLSET_CACHE.get(key)
+        if value is None:
+            value = _TOOLSET_CACHE[key] = factory()
+        return value
+
+    def _tool_schemas(self, name, get_schema):
+        """
+        Schemas of this backend's tools built with get_schema, cached per toolset like _toolset_cached.
+        Each schema is built once per backend class and tool class, and shared by every toolset containing the tool.
+        Also records a digest of the canonical schema JSON, which scopes the response cache.
+        """
+        def build():
+            schemas = []
+            for tool in self.tools.values():
+                key = (type(self), name, type(tool))
+                schema = _TOOL_SCHEMA_CACHE.get(key)
+                if schema is None:
+                    schema = _TOOL_SCHEMA_CACHE[key] = get_schema(tool)
+                schemas.append(schema)
+            return schemas, make_key(schemas)
+        schemas, self._schema_digest = self._toolset_cached(name, build)
+        return schemas
+
+    def _format_each(self, messages, format_message):
+        """
+        Format messages with format_message, reusing the result for messages that were
+        already formatted in the previous call so a turn only formats the new messages.
+        Messages are keyed by identity; the memo only keeps messages of the latest call.
+        """
+        messages = list(messages)
+        previous, previous_formatted = self._format_prefix
+        n = len(previous)
+        # Usual turn: the conversation only grew. The list comparison checks identity first, in C
+        if n and messages[:n] == previous:
+            memo = self._format_memo
+            formatted = previous_formatted.copy()
+            append = formatted.append
+            for m in messages[n:]:
+                entry = memo[id(m)] = (m, format_message(m))
+                append(entry[1])
+            self._format_prefix = (messages, formatted)
+            return formatted.copy()
+
+        # Messages were dropped or replaced (e.g. truncated observations), reuse per message
+        lookup = self._format_memo.get
+        memo = {}
+        formatted = []
+        append = formatted.append # Bound once, this runs for every message of every turn
+        for m in messages:
+            key = id(m)
+            entry = lookup(key)
+            if entry is None or entry[0] is not m:
+                entry = (m, format_message(m))
+            memo[key] = entry
+            append(entry[1])
+        self._format_memo = memo
+        self._format_prefix = (messages, formatted)
+        return formatted.copy()
+
+    def reset_format_cache(self):
+        """Drop memoized message formats, e.g. after editing messages in place"""
+        self._format_memo = {}
+        self._format_prefix = ([], [])
+
+    def _cache_lookup(self, request):
+        """
+        Look up the formatted request in the response cache, then in the semantic cache.
+        Returns (key, cached response); both are None when caching is disabled.
+        """
+        if self.cache is None and self.semantic_cache is None:
+            return None, None
+        scope = self._cache_scope
+        if scope is None:
+            # Everything besides the messages that shapes the response, fixed for the backend.
+            # The schema digest also invalidates cached responses when a tool definition changes
+            scope = self._cache_scope = (self.NAME, self.model, tuple(sorted(self.tools)), self._schema_digest,
+                                         self.get_param(self.role, "temperature"),
+                                         self.get_param(self.role, "top_p"),
+                                         self.get_param(self.role, "max_tokens"))
+        exact_key, semantic_key, cached = None, None, None
+        if self.cache is not None:
+            exact_key = make_key(*scope, request)
+            cached = self.cache.get(exact_key)
+        if cached is None and self.semantic_cache is not None:
+            semantic_key, cached = self.semantic_cache.lookup(scope, request)
+        return (exact_key, semantic_key), cached
+
+    def _cache_store(self, key, response):
+        """Cache a successful response under key from _cache_lookup, returns the response"""
+        if key is not None and response.error is None:
+            exact_key, semantic_key = key
+            if exact_key is not None:
+                self.cache.put(exact_key, response)
+            if semantic_key is not None:
+                self.semantic_cache.put(semantic_key, response)
+        return response
 
     def get_param(self, role: Role, param: str):
         try:
@@ -63,7 +234,7 @@ class Backend:
             return True, tool_call
         try:
             if type(tool_call.arguments) == str:
-                tool_call.parsed_arguments = json.loads(tool_call.arguments)
+                tool_call.parsed_arguments = jsonutils.loads(tool_call.arguments)
             else:
                 tool_call.parsed_arguments = tool_call.arguments
 
@@ -75,22 +246,21 @@ class Backend:
 
             tool = self.tools[tool_call.name]
 
-            present = set(tool_call.parsed_arguments.keys())
-            if missing := (tool.REQUIRED_PARAMETERS - present):
+            args = tool_call.parsed_arguments
+            if missing := (tool._required - args.keys()):
                 tool_res = ToolResult.error_for_call(
                                 tool_call, f"Missing required parameters for {tool_call.name}: {missing}")
                 return False, tool_res
             # Cleanup extra params
-            for extra_param in (present - set(tool.PARAMETERS.keys())):
-                del tool_call.parsed_arguments[extra_param]
+            if not tool._allowed.issuperset(args):
+                tool_call.parsed_arguments = args = {k: v for k, v in args.items() if k in tool._allowed}
             # Cast the params correctly
-            for param in tool.PARAMETERS:
-                ty = tool.PARAMETERS[param][0]
-                if param in tool_call.parsed_arguments and ty == "number":
-                    tool_call.parsed_arguments[param] = float(tool_call.parsed_arguments[param])
+            for param in tool._number_params:
+                if param in args:
+                    args[param] = float(args[param])
 
             return True, tool_call
-        except json.JSONDecodeError as e:
+        except jsonutils.JSONDecodeError as e:
             tool_res = ToolResult.error_for_call(
                             tool_call, f"{type(e).__name__} while decoding parameters for {tool_call.name}: {e}")
             return False, tool_res
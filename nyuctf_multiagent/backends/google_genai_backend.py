@@ -0,0 +1,209 @@
+"""
+Shared implementation for backends built on the google-genai SDK
+(Gemini API, Vertex AI). Subclasses only set up the client.
+"""
+import itertools
+import backoff
+import httpx
+from google import genai
+from google.genai import errors
+from google.genai.types import (
+    FunctionDeclaration, 
+    GenerateContentConfig, 
+    Tool, 
+    Part,
+    Content,
+    FunctionCall,
+    HttpOptions
+)
+
+from ..conversation import MessageRole
+from ..tools import ToolCall, ToolResult
+
+from .backend import Backend, BackendResponse
+from ._http import shared_http_client
+
+# Older google-genai releases cannot take a custom httpx client
+_SHARED_CLIENT_SUPPORTED = "httpx_client" in HttpOptions.model_fields
+
+# Rate limits and server errors are retried with jittered exponential backoff.
+# The SDK itself only retries when HttpOptions.retry_options is set, which the clients here leave unset
+RETRY_CODES = {429, 500, 502, 503, 504}
+retry_transient = backoff.on_exception(backoff.expo, errors.APIError, max_tries=6, jitter=backoff.full_jitter,
+                                       giveup=lambda e: e.code not in RETRY_CODES)
+
+
+def _format_observation(m):
+    # Function response - wrap in Content
+    part = Part.from_function_response(
+        name=m.tool_data.name,
+        response={"result": m.tool_data.result}
+    )
+    return Content(role="user", parts=[part])
+
+def _format_assistant(m):
+    if m.tool_data is None:
+        return Content(role="model", parts=[Part.from_text(text=m.content or "No response")])
+
+    # Function call from assistant - must preserve thought_signature for Gemini 3
+    # Arguments from an OpenAI-style backend are a JSON string, decoded once per call
+    args = m.tool_data.decoded_arguments
+
+    # Check if we have a thought_signature to preserve (required for Gemini 3)
+    thought_sig = getattr(m.tool_data, 'thought_signature', None)
+    # Gemini 3 models REQUIRE thought_signature for function calls
+    # If we don't have one from a previous response, use the skip validator workaround
+    if not thought_sig:
+        thought_sig = "skip_thought_signature_validator"
+
+    # Create Part with thought_signature for Gemini 3 compatibility
+    part = Part(
+        function_call=FunctionCall(name=m.tool_data.name, args=args),
+        thought_signature=thought_sig
+    )
+    return Content(role="model", parts=[part])
+
+def _format_user(m):
+    return Content(role="user", parts=[Part.from_text(text=m.content or "")])
+
+# Dispatch on the message role, anything else is a user message
+_FORMATTERS = {
+    MessageRole.OBSERVATION: _format_observation,
+    MessageRole.ASSISTANT: _format_assistant,
+}
+
+def _format_message(m):
+    return _FORMATTERS.get(m.role, _format_user)(m)
+
+# One client per set of client arguments (API key, or Vertex AI project and location),
+# shared by all roles of a backend so they reuse its HTTP session
+_CLIENTS = {}
+
+def get_client(**client_kwargs):
+    key = tuple(sorted(client_kwargs.items()))
+    client = _CLIENTS.get(key)
+    if client is None:
+        http_options = HttpOptions(httpx_client=shared_http_client()) if _SHARED_CLIENT_SUPPORTED else None
+        client = _CLIENTS[key] = genai.Client(**client_kwargs, http_options=http_options)
+    return client
+
+
+class GoogleGenAIBackend(Backend):
+    """Base class for google-genai backends"""
+    # API errors, and transport errors that the SDK raises unwrapped from httpx
+    CAUGHT_ERRORS = (errors.APIError, httpx.TransportError)
+
+    def __init__(self, role, model, tools, api_key, config):
+        super().__init__(role, model, tools, config)
+        self.client = self._create_client(api_key)
+        self.model = model
+        self.tool_declarations = self._tool_schemas("declarations", self.get_tool_schema)
+        # Fixed for the lifetime of the role, only the system instruction varies between calls
+        self._base_config_kwargs = dict(
+            temperature=self.get_param(self.role, "temperature"),
+            max_output_tokens=int(self.get_param(self.role, "max_tokens")),
+        )
+        if self._has_tools:
+            self.tool = self._toolset_cached("tool", lambda: Tool(function_declarations=self.tool_declarations))
+            self._base_config_kwargs["tools"] = [self.tool]
+        else:
+            self.tool = None
+        self._config_cache = (None, None) # (system, GenerateContentConfig) of the last call
+        # Gemini often omits function call ids, they only need to be unique within the conversation
+        self._call_ids = itertools.count()
+
+    def _create_client(self, api_key):
+        """Return the genai.Client for the backend's credentials, see get_client"""
+        raise NotImplementedError
+
+    @staticmethod
+    def get_tool_schema(tool):
+        """Convert tool to FunctionDeclaration format"""
+        return FunctionDeclaration(
+            name=tool.NAME,
+            description=tool.DESCRIPTION,
+            parameters=tool.parameters_schema()
+        )
+
+    def _generate_config(self, system):
+        # The system prompt is fixed for a conversation, so the config is rebuilt only when it changes
+        cached_system, config = self._config_cache
+        if config is not None and (cached_system is system or cached_system == system):
+            return config
+        if system:
+            config = GenerateContentConfig(**self._base_config_kwargs, system_instruction=str(system))
+        else:
+            config = GenerateContentConfig(**self._base_config_kwargs)
+        self._config_cache = (system, config)
+        return config
+
+    @retry_transient
+    def _call_model(self, request):
+        system, messages = request
+        return self.client.models.generate_content(
+            model=self.model,
+            contents=messages,
+            config=self._generate_config(system)
+        )
+
+    def calculate_cost(self, response):
+        usage = response.usage_metadata
+        if usage:
+            # Token counts can be None for some responses
+            prompt_tokens = usage.prompt_token_count or 0
+            output_tokens = usage.candidates_token_count or 0
+            return (self.in_price * prompt_tokens + 
+                    self.out_price * output_tokens)
+        return 0
+
+    def _format_messages(self, messages):
+        system = None
+        conversation = []
+        append = conversation.append
+        for m in messages:
+            if m.role is MessageRole.SYSTEM:
+                system = m.content
+            else:
+                append(m)
+        return system, self._format_each(conversation, _format_message)
+
+    def _parse_response(self, response):
+        cost = self.calculate_cost(response)
+        try:
+            candidates = response.candidates
+            if not candidates:
+                return BackendResponse(content=None, tool_call=None, cost=cost)
+            
+            # content or parts can be None for blocked/empty responses
+            candidate_content = candidates[0].content
+            if not candidate_content:
+                return BackendResponse(content=None, tool_call=None, cost=cost)
+            
+            parts = candidate_content.parts
+            if not parts:
+                return BackendResponse(content=None, tool_call=None, cost=cost)
+            
+            content = None
+            tool_call = None
+            
+            for part in parts:
+                # Part is a typed model, unset fields are None
+                text = part.text
+                if text:
+                    content = text
+                fc = part.function_call
+                if fc:
+                    # Capture thought_signature from response (required for Gemini 3)
+                    thought_sig = part.thought_signature
+                    tool_call = ToolCall(
+                        name=fc.name, 
+                        id=fc.id or f"call_{next(self._call_ids)}",
+                        # Passed through without a copy, the response object is discarded after parsing
+                        arguments=fc.args or {},
+                        thought_signature=thought_sig
+                    )
+                    
+        except Exception as e:
+            return BackendResponse(error=f"Response parsing error: {e}")
+
+        return BackendResponse(content=content, tool_call=tool_call, cost=cost)
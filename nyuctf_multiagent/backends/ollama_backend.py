@@ -2,104 +2,33 @@
 Ollama Backend for D-CIPHER
 Uses local Ollama server with OpenAI-compatible API
 """
-import json
-from openai import OpenAI, APIError
-from openai.types.chat import ChatCompletionMessage
+from openai import APIError, APIConnectionError, RateLimitError, APITimeoutError, InternalServerError
 
-from ..conversation import MessageRole
-from ..tools import ToolCall, ToolResult
+from .backend import BackendResponse
+from .openai_compat_backend import OpenAICompatBackend
 
-from .backend import Backend, BackendResponse
 
-
-class OllamaBackend(Backend):
+class OllamaBackend(OpenAICompatBackend):
     NAME = 'ollama'
     # Models are now defined in models.yaml
     # All Ollama models have cost 0 since they run locally
 
+    # Ollama uses OpenAI-compatible API at localhost:11434
+    BASE_URL = "http://localhost:11434/v1"
+    # Connection errors are not retried, those mean Ollama is not running
+    RETRY_ERRORS = (RateLimitError, APITimeoutError, InternalServerError)
+    CAUGHT_ERRORS = (APIError,)
+    STREAM_PARAMS = None
+
     def __init__(self, role, model, tools, api_key, config):
-        super().__init__(role, model, tools, config)
-        # Ollama uses OpenAI-compatible API at localhost:11434
         # api_key can be "ollama" or anything (not used by Ollama)
-        base_url = "http://localhost:11434/v1"
-        self.client = OpenAI(base_url=base_url, api_key=api_key or "ollama")
-        self.tool_schemas = [self.get_tool_schema(tool) for tool in tools.values()]
-
-    @staticmethod
-    def get_tool_schema(tool):
-        # Based on OpenAI format
-        return {
-            "type": "function",
-            "function": {
-                "name": tool.NAME,
-                "description": tool.DESCRIPTION,
-                "parameters": {
-                    "type": "object",
-                    "properties": {n: {"type": p[0], "description": p[1]} for n, p in tool.PARAMETERS.items()},
-                    "required": list(tool.REQUIRED_PARAMETERS),
-                }
-            }
-        }
-
-    def _call_model(self, messages) -> ChatCompletionMessage:
-        return self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tool_schemas,
-            tool_choice="auto",
-            temperature=self.get_param(self.role, "temperature"),
-            max_tokens=self.get_param(self.role, "max_tokens")
-        )
+        super().__init__(role, model, tools, api_key or "ollama", config)
 
     def calculate_cost(self, response):
         # Local models are free
         return 0
 
-    def send(self, messages):
-        formatted_messages = []
-        for m in messages:
-            if m.role == MessageRole.OBSERVATION:
-                msg = {"role": "tool",
-                       "content": json.dumps(m.tool_data.result),
-                       "tool_call_id": m.tool_data.id}
-            elif m.role == MessageRole.ASSISTANT:
-                msg = {"role": m.role.value}
-                if m.content is not None:
-                    msg["content"] = m.content
-                if m.tool_data is not None:
-                    msg["tool_calls"] = [{"id": m.tool_data.id,
-                                          "type": "function",
-                                          "function": {
-                                              "name": m.tool_data.name,
-                                              "arguments": m.tool_data.arguments
-                                            }}]
-            else:
-                msg = {"role": m.role.value, "content": m.content}
-            formatted_messages.append(msg)
-
-        try:
-            response = self._call_model(formatted_messages)
-            cost = self.calculate_cost(response)
-
-            # Guard against empty choices (blocked/empty responses)
-            if not response.choices:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-
-            response = response.choices[0].message
-
-            # Guard against None message
-            if not response:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-        except APIError as e:
-            return BackendResponse(error=f"Ollama Backend Error: {e}")
-        except Exception as e:
-            return BackendResponse(error=f"Ollama Connection Error: {e}. Is Ollama running?")
-
-        if response.tool_calls and len(response.tool_calls) > 0:
-            oai_call = response.tool_calls[0]
-            tool_call = ToolCall(name=oai_call.function.name, id=oai_call.id,
-                                 arguments=oai_call.function.arguments)
-        else:
-            tool_call = None
-
-        return BackendResponse(content=response.content, tool_call=tool_call, cost=cost)
+    def error_response(self, error):
+        if isinstance(error, APIConnectionError):
+            return BackendResponse(error=f"Ollama Connection Error: {error}. Is Ollama running?")
+        return BackendResponse(error=f"Ollama Backend Error: {error}")
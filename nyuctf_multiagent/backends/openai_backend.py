@@ -1,101 +1,13 @@
-import json
-from openai import OpenAI, RateLimitError, BadRequestError
-from openai.types.chat import ChatCompletionMessage
+from .openai_compat_backend import OpenAICompatBackend
 
-from ..conversation import MessageRole
-from ..tools import ToolCall, ToolResult
 
-from .backend import Backend, BackendResponse
-
-
-class OpenAIBackend(Backend):
+class OpenAIBackend(OpenAICompatBackend):
     NAME = 'openai'
     # Models are now defined in models.yaml
 
-    def __init__(self, role, model, tools, api_key, config):
-        super().__init__(role, model, tools, config)
-        self.client = OpenAI(api_key=api_key)
-        self.tool_schemas = [self.get_tool_schema(tool) for tool in tools.values()]
-
-    @staticmethod
-    def get_tool_schema(tool):
-        # Based on required OpenAI format, https://platform.openai.com/docs/guides/function-calling
-        return {
-            "type": "function",
-            "function": {
-                "name": tool.NAME,
-                "description": tool.DESCRIPTION,
-                "parameters": {
-                    "type": "object",
-                    "properties": {n: {"type": p[0], "description": p[1]} for n, p in tool.PARAMETERS.items()},
-                    "required": list(tool.REQUIRED_PARAMETERS),
-                }
-            }
-        }
-
-    # @backoff.on_exception(backoff.expo, RateLimitError, max_tries=5)
-    def _call_model(self, messages) -> ChatCompletionMessage:
-        return self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tool_schemas,
-            tool_choice="auto", # TODO try "required" here to force a function call
-            parallel_tool_calls=False,
-            temperature=self.get_param(self.role, "temperature"),
-            top_p=self.get_param(self.role, "top_p"),
-            max_tokens=self.get_param(self.role, "max_tokens")
-        )
-
-    def calculate_cost(self, response):
-        if response.usage:
-            prompt_tokens = response.usage.prompt_tokens or 0
-            completion_tokens = response.usage.completion_tokens or 0
-            return self.in_price * prompt_tokens + self.out_price * completion_tokens
-        return 0
-
-    def send(self, messages):
-        formatted_messages = []
-        for m in messages:
-            if m.role == MessageRole.OBSERVATION:
-                msg = {"role": "tool",
-                       "content": json.dumps(m.tool_data.result),
-                       "tool_call_id": m.tool_data.id}
-            elif m.role == MessageRole.ASSISTANT:
-                msg = {"role": m.role.value}
-                if m.content is not None:
-                    msg["content"] = m.content
-                if m.tool_data is not None:
-                    msg["tool_calls"] = [{"id": m.tool_data.id,
-                                          "type": "function",
-                                          "function": {
-                                              "name": m.tool_data.name,
-                                              "arguments": m.tool_data.arguments
-                                            }}]
-            else:
-                msg = {"role": m.role.value, "content": m.content}
-            formatted_messages.append(msg)
-
-        try:
-            response = self._call_model(formatted_messages)
-            cost = self.calculate_cost(response)
-
-            # Guard against empty choices (blocked/empty responses)
-            if not response.choices:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-
-            response = response.choices[0].message
-
-            # Guard against None message
-            if not response:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-        except BadRequestError as e:
-            return BackendResponse(error=f"Backend Error: {e}")
-
-        if response.tool_calls and len(response.tool_calls) > 0:
-            oai_call = response.tool_calls[0]
-            tool_call = ToolCall(name=oai_call.function.name, id=oai_call.id,
-                                 arguments=oai_call.function.arguments)
-        else:
-            tool_call = None
-
-        return BackendResponse(content=response.content, tool_call=tool_call, cost=cost)
+    def _extra_params(self):
+        params = dict(top_p=self.get_param(self.role, "top_p"))
+        if self._has_tools:
+            # Only valid together with tools
+            params["parallel_tool_calls"] = False
+        return params
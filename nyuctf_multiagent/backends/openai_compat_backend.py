@@ -0,0 +1,139 @@
+"""
+Shared implementation for backends that speak the OpenAI chat completions API
+(OpenAI, OpenRouter, Ollama). Subclasses set up the client and adjust the request.
+"""
+import backoff
+from openai import OpenAI, RateLimitError, BadRequestError, APITimeoutError, APIConnectionError, InternalServerError
+from openai.types.chat import ChatCompletionMessage
+
+from ..conversation import MessageRole
+from ..tools import ToolCall
+
+from .backend import Backend, BackendResponse
+from ._http import shared_http_client
+from .streaming import ChatStreamAccumulator
+
+
+def _format_observation(m):
+    return {"role": "tool",
+            "content": m.tool_data.to_json(),
+            "tool_call_id": m.tool_data.id}
+
+def _format_assistant(m):
+    msg = {"role": m.role.value}
+    if m.content is not None:
+        msg["content"] = m.content
+    if m.tool_data is not None:
+        msg["tool_calls"] = [{"id": m.tool_data.id,
+                              "type": "function",
+                              "function": {
+                                  "name": m.tool_data.name,
+                                  "arguments": m.tool_data.arguments
+                                }}]
+    return msg
+
+def _format_text(m):
+    return {"role": m.role.value, "content": m.content}
+
+# Dispatch on the message role, system and user messages are plain text
+_FORMATTERS = {
+    MessageRole.OBSERVATION: _format_observation,
+    MessageRole.ASSISTANT: _format_assistant,
+}
+
+def _format_message(m):
+    return _FORMATTERS.get(m.role, _format_text)(m)
+
+
+class OpenAICompatBackend(Backend):
+    """Base class for OpenAI-compatible backends"""
+    BASE_URL = None # None uses the OpenAI API
+    # Transient errors are retried with jittered exponential backoff; 5xx responses raise InternalServerError.
+    # This is the only retry layer, the client is created with the SDK's own retries disabled
+    RETRY_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+    # Errors turned into an error response instead of raising
+    CAUGHT_ERRORS = (BadRequestError,)
+    # Usage arrives in a final chunk, needed for the cost. None disables streaming for the backend
+    STREAM_PARAMS = {"stream": True, "stream_options": {"include_usage": True}}
+
+    def __init__(self, role, model, tools, api_key, config):
+        super().__init__(role, model, tools, config)
+        self.client = OpenAI(base_url=self.BASE_URL, api_key=api_key, http_client=shared_http_client(), max_retries=0)
+        self.tool_schemas = self._tool_schemas("schemas", self.get_tool_schema)
+        # TODO try tool_choice "required" here to force a function call
+        self._tool_params = dict(tools=self.tool_schemas, tool_choice="auto") if self._has_tools else {}
+        retry = backoff.on_exception(backoff.expo, self.RETRY_ERRORS, max_tries=6, jitter=backoff.full_jitter)
+        self._call_model = retry(self._call_model)
+
+    @property
+    def streaming(self):
+        return self.stream and self.STREAM_PARAMS is not None
+
+    @staticmethod
+    def get_tool_schema(tool):
+        # Based on required OpenAI format, https://platform.openai.com/docs/guides/function-calling
+        return {
+            "type": "function",
+            "function": {
+                "name": tool.NAME,
+                "description": tool.DESCRIPTION,
+                "parameters": tool.parameters_schema()
+            }
+        }
+
+    def _extra_params(self):
+        """Backend specific request parameters"""
+        return {}
+
+    def _request_params(self, messages):
+        return dict(
+            model=self.model,
+            messages=messages,
+            **self._tool_params,
+            temperature=self.get_param(self.role, "temperature"),
+            max_tokens=self.get_param(self.role, "max_tokens"),
+            **self._extra_params()
+        )
+
+    def _call_model(self, messages) -> ChatCompletionMessage:
+        if self.streaming:
+            accumulator = ChatStreamAccumulator()
+            for chunk in self.client.chat.completions.create(**self._request_params(messages), **self.STREAM_PARAMS):
+                accumulator.add(chunk)
+            return accumulator
+        return self.client.chat.completions.create(**self._request_params(messages))
+
+    def calculate_cost(self, response):
+        if response.usage:
+            prompt_tokens = response.usage.prompt_tokens or 0
+            completion_tokens = response.usage.completion_tokens or 0
+            return self.in_price * prompt_tokens + self.out_price * completion_tokens
+        return 0
+
+    def _format_messages(self, messages):
+        return self._format_each(messages, _format_message)
+
+    def _parse_response(self, response):
+        cost = self.calculate_cost(response)
+        if isinstance(response, ChatStreamAccumulator):
+            return response.response(cost)
+
+        # Guard against empty choices (blocked/empty responses)
+        if not response.choices:
+            return BackendResponse(content=None, tool_call=None, cost=cost)
+
+        response = response.choices[0].message
+
+        # Guard against None message
+        if not response:
+            return BackendResponse(content=None, tool_call=None, cost=cost)
+
+        if response.tool_calls and len(response.tool_calls) > 0:
+            oai_call = response.tool_calls[0]
+            tool_call = ToolCall(name=oai_call.function.name, id=oai_call.id,
+                                 arguments=oai_call.function.arguments)
+        else:
+            tool_call = None
+
+        return BackendResponse(content=response.content, tool_call=tool_call, cost=cost)
+
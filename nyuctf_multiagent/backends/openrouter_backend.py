@@ -3,111 +3,47 @@ OpenRouter Backend for D-CIPHER
 Access 200+ models including Claude, GPT, Llama, Mistral via OpenRouter API
 Get API key from: https://openrouter.ai/keys
 """
-import json
-from openai import OpenAI, APIError
-from openai.types.chat import ChatCompletionMessage
+from openai import APIError, APIConnectionError
 
-from ..conversation import MessageRole
-from ..tools import ToolCall, ToolResult
+from .backend import BackendResponse
+from .openai_compat_backend import OpenAICompatBackend
 
-from .backend import Backend, BackendResponse
+EPHEMERAL = {"type": "ephemeral"}
 
+def _with_cache_breakpoint(msg):
+    """Copy of msg with its text content marked as a cache breakpoint"""
+    return {**msg, "content": [{"type": "text", "text": msg["content"], "cache_control": EPHEMERAL}]}
 
-class OpenRouterBackend(Backend):
+
+class OpenRouterBackend(OpenAICompatBackend):
     NAME = 'openrouter'
     # Models are now defined in models.yaml
     # Full model list: https://openrouter.ai/models
 
-    def __init__(self, role, model, tools, api_key, config):
-        super().__init__(role, model, tools, config)
-        # OpenRouter uses OpenAI-compatible API
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key
-        )
-        self.tool_schemas = [self.get_tool_schema(tool) for tool in tools.values()]
-
-    @staticmethod
-    def get_tool_schema(tool):
-        return {
-            "type": "function",
-            "function": {
-                "name": tool.NAME,
-                "description": tool.DESCRIPTION,
-                "parameters": {
-                    "type": "object",
-                    "properties": {n: {"type": p[0], "description": p[1]} for n, p in tool.PARAMETERS.items()},
-                    "required": list(tool.REQUIRED_PARAMETERS),
-                }
-            }
-        }
-
-    def _call_model(self, messages) -> ChatCompletionMessage:
-        return self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tool_schemas,
-            tool_choice="auto",
-            temperature=self.get_param(self.role, "temperature"),
-            max_tokens=self.get_param(self.role, "max_tokens"),
+    # OpenRouter uses OpenAI-compatible API
+    BASE_URL = "https://openrouter.ai/api/v1"
+    CAUGHT_ERRORS = (APIError,)
+    # OpenRouter streams OpenAI-style chunks and accepts stream_options for the final usage chunk
+
+    def _request_params(self, messages):
+        # Anthropic models are only cached with explicit breakpoints, which OpenRouter passes through.
+        # Breakpoints after the system prompt and on the latest message let each turn read the history from the cache.
+        if self.prompt_cache and self.model.startswith("anthropic/"):
+            messages = list(messages)
+            for i in (0, -1):
+                if messages and messages[i]["role"] != "assistant" and isinstance(messages[i].get("content"), str):
+                    messages[i] = _with_cache_breakpoint(messages[i])
+        return super()._request_params(messages)
+
+    def _extra_params(self):
+        return dict(
             extra_headers={
                 "HTTP-Referer": "https://github.com/NYU-LLM-CTF",
                 "X-Title": "D-CIPHER CTF Agent"
             }
         )
 
-    def calculate_cost(self, response):
-        if response.usage:
-            prompt_tokens = response.usage.prompt_tokens or 0
-            completion_tokens = response.usage.completion_tokens or 0
-            return self.in_price * prompt_tokens + self.out_price * completion_tokens
-        return 0
-
-    def send(self, messages):
-        formatted_messages = []
-        for m in messages:
-            if m.role == MessageRole.OBSERVATION:
-                msg = {"role": "tool",
-                       "content": json.dumps(m.tool_data.result),
-                       "tool_call_id": m.tool_data.id}
-            elif m.role == MessageRole.ASSISTANT:
-                msg = {"role": m.role.value}
-                if m.content is not None:
-                    msg["content"] = m.content
-                if m.tool_data is not None:
-                    msg["tool_calls"] = [{"id": m.tool_data.id,
-                                          "type": "function",
-                                          "function": {
-                                              "name": m.tool_data.name,
-                                              "arguments": m.tool_data.arguments
-                                            }}]
-            else:
-                msg = {"role": m.role.value, "content": m.content}
-            formatted_messages.append(msg)
-
-        try:
-            response = self._call_model(formatted_messages)
-            cost = self.calculate_cost(response)
-
-            # Guard against empty choices (blocked/empty responses)
-            if not response.choices:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-
-            response = response.choices[0].message
-
-            # Guard against None message
-            if not response:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-        except APIError as e:
-            return BackendResponse(error=f"OpenRouter Error: {e}")
-        except Exception as e:
-            return BackendResponse(error=f"OpenRouter Connection Error: {e}")
-
-        if response.tool_calls and len(response.tool_calls) > 0:
-            oai_call = response.tool_calls[0]
-            tool_call = ToolCall(name=oai_call.function.name, id=oai_call.id,
-                                 arguments=oai_call.function.arguments)
-        else:
-            tool_call = None
-
-        return BackendResponse(content=response.content, tool_call=tool_call, cost=cost)
+    def error_response(self, error):
+        if isinstance(error, APIConnectionError):
+            return BackendResponse(error=f"OpenRouter Connection Error: {error}")
+        return BackendResponse(error=f"OpenRouter Error: {error}")
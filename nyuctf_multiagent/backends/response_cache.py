@@ -0,0 +1,119 @@
+"""
+In-memory cache of backend responses, keyed on the exact request sent to the model.
+Lets retries and replays of an identical prompt skip the API call.
+Optionally backed by a SQLite file so cached responses survive across runs.
+"""
+import copy
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+
+from .. import jsonutils
+
+def _encode(obj):
+    # SDK request objects (e.g. genai Content) are pydantic models
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", exclude_none=True)
+    return str(obj)
+
+def make_key(*parts):
+    """Deterministic SHA-256 key of JSON serializable request parts"""
+    encoded = jsonutils.compact_dumps(parts, sort_keys=True, default=_encode)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+class SQLiteStore:
+    """Persistent key -> (expiry, response) table, expiry is wall clock time"""
+    def __init__(self, path):
+        # The store is shared by every backend in the process, serialize access across threads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL") # Parallel runs can share the file
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expiry REAL, response BLOB)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT expiry, response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return row[0], pickle.loads(row[1])
+
+    def put(self, key, expiry, response):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                             (key, expiry, pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+class ResponseCache:
+    """LRU cache of BackendResponse with a per-entry time to live, optionally backed by a SQLite file"""
+    def __init__(self, maxsize=10_000, ttl=24*60*60, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict() # key -> (expiry, response)
+        self._store = SQLiteStore(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the cached response for key or None.
+        A hit is free, so it is returned with cost 0 and its own copy of the tool call.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            entry = self._load(key)
+            if entry is None:
+                self.misses += 1
+                return None
+        self._entries.move_to_end(key)
+        self._evict()
+        self.hits += 1
+        response = entry[1]
+        return replace(response, cost=0, tool_call=copy.deepcopy(response.tool_call))
+
+    def _load(self, key):
+        """Move an entry from the persistent store into memory"""
+        if self._store is None:
+            return None
+        stored = self._store.get(key)
+        if stored is None:
+            return None
+        expiry, response = stored
+        entry = self._entries[key] = (time.monotonic() + expiry - time.time(), response)
+        return entry
+
+    def put(self, key, response):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        self._evict()
+        if self._store is not None:
+            self._store.put(key, time.time() + self.ttl, response)
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# Shared by all backends of the process, so identical requests from any role hit
+_response_cache = None
+
+def get_response_cache(ttl, path=None):
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(ttl=ttl, path=path)
+    return _response_cache
@@ -0,0 +1,133 @@
+"""
+Semantic cache of backend responses, consulted after an exact cache miss.
+A request whose latest turns embed close enough (cosine similarity) to an answered
+request of the same model, tools and sampling parameters, the same conversation
+(system prompt and first user message, which holds the challenge) and the same
+conversation length reuses that response.
+Needs the optional sentence-transformers package.
+"""
+import copy
+import threading
+import uuid
+from dataclasses import replace
+
+from .. import jsonutils
+from .response_cache import _encode, make_key
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+def _split_request(request):
+    """(head, messages) of a formatted request, head is the system prompt and first user message"""
+    if isinstance(request, tuple):
+        # (system, messages) for backends that pass the system prompt separately
+        system, messages = request
+        return [system, *messages[:1]], messages
+    return request[:2], request
+
+def request_scope(scope, request):
+    """
+    Scope of a formatted request: the backend scope, the conversation it belongs to and its length.
+    Requests of other challenges or tasks, and earlier turns of the same conversation, never match.
+    """
+    head, messages = _split_request(request)
+    return (scope, make_key(head), len(messages))
+
+def request_text(request, turns=2):
+    """Text embedded for a formatted request: the latest turns, the rest is fixed by request_scope"""
+    _, messages = _split_request(request)
+    return jsonutils.compact_dumps(messages[-turns:], default=_encode)
+
+def _fresh_id(tool_call):
+    """Copy of tool_call with a new id, a replayed call must not reuse an id of the conversation"""
+    if tool_call is None:
+        return None
+    tool_call = copy.deepcopy(tool_call)
+    tool_call.id = f"call_{uuid.uuid4().hex[:24]}"
+    return tool_call
+
+class _ScopeEntries:
+    """Bounded (embedding, response) store, embeddings are rows of one matrix for a vectorized scan"""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.matrix = None
+        self.responses = []
+        self._next = 0 # Row overwritten next once full
+
+    def add(self, embedding, response):
+        n = len(self.responses)
+        if n < self.maxsize:
+            if self.matrix is None or n == len(self.matrix):
+                # Grow geometrically up to maxsize instead of allocating it upfront
+                grown = np.empty((min(max(2 * n, 16), self.maxsize), len(embedding)), dtype=np.float32)
+                if n:
+                    grown[:n] = self.matrix
+                self.matrix = grown
+            self.matrix[n] = embedding
+            self.responses.append(response)
+        else:
+            # Full, replace the oldest entry
+            i = self._next
+            self.matrix[i] = embedding
+            self.responses[i] = response
+            self._next = (i + 1) % self.maxsize
+
+    def best(self, embedding, threshold):
+        """Response of the most similar entry with a similarity of at least threshold, or None"""
+        # Embeddings are normalized, so the dot products are the cosine similarities
+        scores = self.matrix[:len(self.responses)] @ embedding
+        i = int(scores.argmax())
+        return self.responses[i] if scores[i] >= threshold else None
+
+class SemanticCache:
+    """Nearest neighbour lookup over normalized embeddings, per request_scope"""
+    def __init__(self, threshold=0.92, model_name=DEFAULT_MODEL, maxsize=10_000):
+        if SentenceTransformer is None:
+            raise ImportError("experiment.semantic_cache requires the sentence-transformers package")
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._model = SentenceTransformer(model_name)
+        self._lock = threading.Lock() # Encoding is not thread safe, the cache is shared by every backend in the process
+        self._entries = {} # request scope -> _ScopeEntries
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, text):
+        with self._lock:
+            return self._model.encode(text, normalize_embeddings=True).astype(np.float32, copy=False)
+
+    def lookup(self, scope, request):
+        """
+        Return (key, response) for the most similar cached request above the threshold.
+        The response is None on a miss; the key is passed back to put to store the answer.
+        A replayed tool call gets a fresh id.
+        """
+        key = (request_scope(scope, request), self.embed(request_text(request)))
+        entries = self._entries.get(key[0])
+        best = None if entries is None else entries.best(key[1], self.threshold)
+        if best is None:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        return key, replace(best, cost=0, tool_call=_fresh_id(best.tool_call))
+
+    def put(self, key, response):
+        scope, embedding = key
+        entries = self._entries.get(scope)
+        if entries is None:
+            entries = self._entries[scope] = _ScopeEntries(self.maxsize)
+        entries.add(embedding, response)
+
+# Shared by all backends of the process, loading the embedding model once
+_semantic_cache = None
+
+def get_semantic_cache(threshold):
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(threshold=threshold)
+    return _semantic_cache
@@ -0,0 +1,61 @@
+"""
+Reassemble streamed OpenAI-style chat completions.
+Used by the OpenAI-compatible backends when experiment.stream is enabled.
+"""
+from ..tools import ToolCall
+
+from .backend import BackendResponse
+
+
+class ChatStreamAccumulator:
+    """Accumulates the chunks of a streamed chat completion (first choice only)"""
+    def __init__(self):
+        self._content = []
+        self._tool_calls = {} # tool call index -> {"id", "name", "arguments": [fragments]}
+        self.usage = None
+        self.finish_reason = None
+        self.error = None
+
+    def add(self, chunk):
+        # With stream_options include_usage, the last chunk has usage and no choices
+        if chunk.usage:
+            self.usage = chunk.usage
+        # Errors after the response started (e.g. OpenRouter provider errors) arrive as a chunk
+        error = getattr(chunk, "error", None)
+        if error:
+            self.error = error.get("message", error) if isinstance(error, dict) else error
+        for choice in chunk.choices:
+            if choice.index != 0:
+                continue
+            delta = choice.delta
+            if delta is not None:
+                if delta.content:
+                    self._content.append(delta.content)
+                for tc in delta.tool_calls or ():
+                    call = self._tool_calls.setdefault(tc.index, {"id": None, "name": None, "arguments": []})
+                    if tc.id:
+                        call["id"] = tc.id
+                    if tc.function is not None:
+                        if tc.function.name:
+                            call["name"] = tc.function.name
+                        if tc.function.arguments:
+                            call["arguments"].append(tc.function.arguments)
+            if choice.finish_reason:
+                self.finish_reason = choice.finish_reason
+
+    @property
+    def content(self):
+        return "".join(self._content) if self._content else None
+
+    @property
+    def tool_call(self):
+        """The first completed tool call, or None"""
+        if not self._tool_calls:
+            return None
+        call = self._tool_calls[min(self._tool_calls)]
+        return ToolCall(name=call["name"], id=call["id"], arguments="".join(call["arguments"]))
+
+    def response(self, cost):
+        if self.error is not None:
+            return BackendResponse(error=f"Stream Error: {self.error}", cost=cost)
+        return BackendResponse(content=self.content, tool_call=self.tool_call, cost=cost)
@@ -1,6 +1,6 @@
-import json
 from together import Together
-from together.error import InvalidRequestError, RateLimitError
+import backoff
+from together.error import InvalidRequestError, RateLimitError, Timeout, ServiceUnavailableError, APIConnectionError
 from together.types.chat_completions import ChatCompletionMessage
 
 from ..conversation import MessageRole
@@ -8,20 +8,60 @@ from ..tools import ToolCall, ToolResult
 
 from .backend import Backend, BackendResponse
 
+# Transient errors are retried with jittered exponential backoff.
+# This is the only retry layer, the client is created with the SDK's own retries disabled
+RETRY_ERRORS = (RateLimitError, Timeout, ServiceUnavailableError, APIConnectionError)
+retry_transient = backoff.on_exception(backoff.expo, RETRY_ERRORS, max_tries=6, jitter=backoff.full_jitter)
+
+def _format_observation(m):
+    return {"role": "tool",
+            "content": m.tool_data.to_json(),
+            "tool_call_id": m.tool_data.id,
+            "name": m.tool_data.name}
+
+def _format_assistant(m):
+    msg = {"role": m.role.value}
+    if m.content is not None:
+        msg["content"] = m.content
+    if m.tool_data is not None:
+        msg["tool_calls"] = [{"id": m.tool_data.id,
+                              "type": "function",
+                              "function": {
+                                  "name": m.tool_data.name,
+                                  "arguments": m.tool_data.arguments
+                                }}]
+    return msg
+
+def _format_text(m):
+    return {"role": m.role.value, "content": m.content}
+
+# Dispatch on the message role, system and user messages are plain text
+_FORMATTERS = {
+    MessageRole.OBSERVATION: _format_observation,
+    MessageRole.ASSISTANT: _format_assistant,
+}
+
+def _format_message(m):
+    return _FORMATTERS.get(m.role, _format_text)(m)
+
+
 class TogetherBackend(Backend):
     """
     Backend for Together.ai
     """
     NAME = "together"
     # Models are now defined in models.yaml
+    CAUGHT_ERRORS = (InvalidRequestError,)
 
     def __init__(self, role, model, tools, api_key, config):
         super().__init__(role, model, tools, config)
-        self.client = Together(api_key=api_key)
+        self.client = Together(api_key=api_key, max_retries=0)
         if self.get_param(self.role, "strict"):
-            self.tool_schemas = [self.get_tool_schema_strict(tool) for tool in tools.values()]
+            self.tool_schemas = self._tool_schemas("strict_schemas", self.get_tool_schema_strict)
         else:
-            self.tool_schemas = [self.get_tool_schema(tool) for tool in tools.values()]
+            self.tool_schemas = self._tool_schemas("schemas", self.get_tool_schema)
+        # TODO try tool_choice "required" here to force a function call
+        self._tool_params = dict(tools=self.tool_schemas, tool_choice="auto") if self._has_tools else {}
 
     @staticmethod
     def get_tool_schema(tool):
@@ -31,11 +71,7 @@ class TogetherBackend(Backend):
             "function": {
                 "name": tool.NAME,
                 "description": tool.DESCRIPTION,
-                "parameters": {
-                    "type": "object",
-                    "properties": {n: {"type": p[0], "description": p[1]} for n, p in tool.PARAMETERS.items()},
-                    "required": list(tool.REQUIRED_PARAMETERS),
-                },
+                "parameters": tool.parameters_schema(),
             }
         }
 
@@ -63,16 +99,19 @@ class TogetherBackend(Backend):
                 prop["type"] = [prop["type"], "null"]
         return schema
 
-    def _call_model(self, messages) -> ChatCompletionMessage:
-        return self.client.chat.completions.create(
+    def _request_params(self, messages):
+        return dict(
             model=self.model,
             messages=messages,
-            tools=self.tool_schemas,
-            tool_choice="auto", # TODO try "required" here to force a function call
+            **self._tool_params,
             temperature=self.get_param(self.role, "temperature"),
             max_tokens=self.get_param(self.role, "max_tokens")
         )
 
+    @retry_transient
+    def _call_model(self, messages) -> ChatCompletionMessage:
+        return self.client.chat.completions.create(**self._request_params(messages))
+
     def calculate_cost(self, response):
         if response.usage:
             prompt_tokens = response.usage.prompt_tokens or 0
@@ -80,44 +119,21 @@ class TogetherBackend(Backend):
             return self.in_price * prompt_tokens + self.out_price * completion_tokens
         return 0
 
-    def send(self, messages):
-        formatted_messages = []
-        for m in messages:
-            if m.role == MessageRole.OBSERVATION:
-                msg = {"role": "tool",
-                       "content": json.dumps(m.tool_data.result),
-                       "tool_call_id": m.tool_data.id,
-                       "name": m.tool_data.name}
-            elif m.role == MessageRole.ASSISTANT:
-                msg = {"role": m.role.value}
-                if m.content is not None:
-                    msg["content"] = m.content
-                if m.tool_data is not None:
-                    msg["tool_calls"] = [{"id": m.tool_data.id,
-                                          "type": "function",
-                                          "function": {
-                                              "name": m.tool_data.name,
-                                              "arguments": m.tool_data.arguments
-                                            }}]
-            else:
-                msg = {"role": m.role.value, "content": m.content}
-            formatted_messages.append(msg)
-
-        try:
-            response = self._call_model(formatted_messages)
-            cost = self.calculate_cost(response)
-
-            # Guard against empty choices (blocked/empty responses)
-            if not response.choices:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-
-            response = response.choices[0].message
-
-            # Guard against None message
-            if not response:
-                return BackendResponse(content=None, tool_call=None, cost=cost)
-        except InvalidRequestError as e:
-            return BackendResponse(error=f"Backend Error: {e}")
+    def _format_messages(self, messages):
+        return self._format_each(messages, _format_message)
+
+    def _parse_response(self, response):
+        cost = self.calculate_cost(response)
+
+        # Guard against empty choices (blocked/empty responses)
+        if not response.choices:
+            return BackendResponse(content=None, tool_call=None, cost=cost)
+
+        response = response.choices[0].message
+
+        # Guard against None message
+        if not response:
+            return BackendResponse(content=None, tool_call=None, cost=cost)
 
         if response.tool_calls and len(response.tool_calls) > 0:
             f_call = response.tool_calls[0]
@@ -127,3 +143,4 @@ class TogetherBackend(Backend):
             tool_call = None
 
         return BackendResponse(content=response.content, tool_call=tool_call, cost=cost)
+
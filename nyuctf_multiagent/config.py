@@ -6,6 +6,15 @@ class ExperimentConfig:
     max_cost: float
     enable_autoprompt: bool
     use_kali: bool = False  # Use Kali Linux Docker image instead of Ubuntu
+    cache_enabled: bool = False  # Reuse backend responses for identical requests
+    cache_ttl: float = 24*60*60  # Seconds a cached response stays valid
+    cache_sampled: bool = False  # Also cache roles with temperature > 0, replays then repeat one sample
+    cache_path: str = None  # SQLite file to persist cached responses across runs
+    semantic_cache: bool = False  # Reuse responses of similar requests, needs sentence-transformers
+    semantic_threshold: float = 0.92  # Minimum cosine similarity for a semantic cache hit
+    stream: bool = False  # Stream completions from backends that support it
+    prompt_cache: bool = False  # Mark the stable prompt prefix for provider-side caching (Anthropic models)
+    strict_prefix: bool = False  # Order tool schemas by name so every role and config shares the cached prefix
 
 @dataclass
 class AgentConfig:
@@ -25,7 +34,16 @@ class Config:
         self.experiment = ExperimentConfig(
             max_cost=self.config_yaml.get("experiment", {}).get("max_cost", 1.0),
             enable_autoprompt=self.config_yaml.get("experiment", {}).get("enable_autoprompt", True),
-            use_kali=self.config_yaml.get("experiment", {}).get("use_kali", False)
+            use_kali=self.config_yaml.get("experiment", {}).get("use_kali", False),
+            cache_enabled=self.config_yaml.get("experiment", {}).get("cache_enabled", False),
+            cache_ttl=self.config_yaml.get("experiment", {}).get("cache_ttl", 24*60*60),
+            cache_sampled=self.config_yaml.get("experiment", {}).get("cache_sampled", False),
+            cache_path=self.config_yaml.get("experiment", {}).get("cache_path", None),
+            semantic_cache=self.config_yaml.get("experiment", {}).get("semantic_cache", False),
+            semantic_threshold=self.config_yaml.get("experiment", {}).get("semantic_threshold", 0.92),
+            stream=self.config_yaml.get("experiment", {}).get("stream", False),
+            prompt_cache=self.config_yaml.get("experiment", {}).get("prompt_cache", False),
+            strict_prefix=self.config_yaml.get("experiment", {}).get("strict_prefix", False)
         )
 
         self.planner = AgentConfig(
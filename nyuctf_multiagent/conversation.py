@@ -45,6 +45,8 @@ class Conversation:
         self.name = name
         self.truncate_content = truncate_content
         self.len_observations = len_observations
+        self._stripped = {} # id of assistant message -> copy without its tool call
+        self._released = 0 # all_messages before this position are out of the window and released
 
     @property
     def messages(self):
@@ -56,13 +58,20 @@ class Conversation:
         if self.len_observations is not None:
             trunc_before = self.round - self.len_observations
         for m in self.all_messages:
-            if m.role == MessageRole.OBSERVATION and m.index <= trunc_before:
+            # Recent messages (all of them without len_observations) pass the index check alone
+            if m.index > trunc_before:
+                yield m
+            elif m.role is MessageRole.OBSERVATION:
                 # Truncate observations
                 continue
-            elif m.role == MessageRole.ASSISTANT and m.index <= trunc_before:
+            elif m.role is MessageRole.ASSISTANT:
                 if m.content is not None:
-                    # Remove tool calls from assistant actions and yield only thought
-                    yield replace(m, tool_data=None)
+                    # Remove tool calls from assistant actions and yield only thought.
+                    # The copy is made once, so backends get the same message every turn and reuse its format
+                    stripped = self._stripped.get(id(m))
+                    if stripped is None:
+                        stripped = self._stripped[id(m)] = replace(m, tool_data=None)
+                    yield stripped
                 else:
                     # Without tool_call, message is empty so skip
                     continue
@@ -77,6 +86,15 @@ class Conversation:
 
     def next_round(self):
         self.round += 1
+        if self.len_observations is not None:
+            # Observations falling out of the window are never sent again, release their memoized JSON encoding.
+            # Messages are appended in round order, so only the ones past the last release are checked
+            trunc_before = self.round - self.len_observations
+            while self._released < len(self.all_messages) and self.all_messages[self._released].index <= trunc_before:
+                m = self.all_messages[self._released]
+                if m.role is MessageRole.OBSERVATION and m.tool_data is not None:
+                    m.tool_data.serialized = None
+                self._released += 1
     def append(self, role, content, tool_data=None):
         m = Message(index=self.round, role=role, content=content, tool_data=tool_data)
         self.all_messages.append(m)
@@ -95,5 +113,7 @@ class Conversation:
             for key in tool_data.result.keys():
                 if type(tool_data.result[key]) == str and len(tool_data.result[key]) > self.truncate_content:
                     tool_data.result[key] = tool_data.result[key][:self.truncate_content - len(truncate_message)] + truncate_message
+        # The result may have changed, drop any memoized encoding
+        tool_data.serialized = None
 
         self.append(MessageRole.OBSERVATION, None, tool_data)
@@ -0,0 +1,36 @@
+"""
+JSON helpers for the agent.
+dumps is used for everything sent to the models and is exactly json.dumps, so model
+inputs never depend on whether orjson is installed.
+compact_dumps and loads use orjson when installed, for JSON that is never sent to a model
+(cache keys) and for parsing; anything orjson refuses (e.g. ints over 64 bits) falls back to the stdlib json.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so callers can catch either decoder's errors
+JSONDecodeError = json.JSONDecodeError
+
+def dumps(obj):
+    """JSON string of obj for model inputs, byte-identical to json.dumps(obj)"""
+    return json.dumps(obj)
+
+def compact_dumps(obj, sort_keys=False, default=str):
+    """Compact JSON string of obj for internal use, unknown types (e.g. bytes) are encoded with default"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, default=default, separators=(",", ":"))
+
+def loads(s):
+    """Parse a JSON str or bytes"""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
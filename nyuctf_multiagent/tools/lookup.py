@@ -1,10 +1,211 @@
 import csv
 import os
+import pickle
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 from ..logging import logger
 from .tool import Tool
 
+# Default path to the documentation CSV
+# Path: tools/lookup.py -> nyuctf_multiagent/ -> ctf-agents/ -> docker/kali/
+DEFAULT_CSV_PATH = Path(__file__).parent.parent.parent / "docker" / "kali" / "commands_documentation.csv"
+
+
+def _parse_csv(path):
+    """Parse the commands documentation CSV, keyed by lowercase command name"""
+    commands = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            cmd_name = row.get('command', '').strip().lower()
+            if cmd_name:
+                commands[cmd_name] = {
+                    'command': row.get('command', '').strip(),
+                    # A handful of distinct values, shared by all rows (and by the pickle's memo)
+                    'category': sys.intern(row.get('category', '').strip()),
+                    'brief': row.get('brief', '').strip(),
+                    'description': row.get('description', '').strip(),
+                    'usage': row.get('usage', '').strip(),
+                    'examples': row.get('examples', '').strip(),
+                }
+    return commands
+
+
+@lru_cache(maxsize=8)
+def _load_csv(path):
+    """
+    Load the commands documentation CSV, keyed by lowercase command name.
+    Read once per process and shared by every tool instance, so the result must not be mutated.
+    The parsed commands are cached in a pickle next to the CSV and reused until the CSV changes.
+    """
+    if not os.path.exists(path):
+        logger.print(f"[yellow]Warning: Commands documentation not found at {path}[/yellow]", markup=True)
+        return {}
+
+    cache_path = Path(path).with_suffix('.pkl')
+    try:
+        if cache_path.stat().st_mtime >= os.path.getmtime(path):
+            return pickle.loads(cache_path.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    try:
+        commands = _parse_csv(path)
+    except Exception as e:
+        logger.print(f"[red]Error loading commands documentation: {e}[/red]", markup=True)
+        return {}
+
+    try:
+        # Write then rename, so parallel runs never read a partial pickle
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(pickle.dumps(commands, protocol=5))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass # Read-only install, parse every time
+    return commands
+
+
+@lru_cache(maxsize=8)
+def _render_list(path):
+    """Markdown list of the CSV commands grouped by category, rendered once per process"""
+    by_category = {}
+    for cmd_name, cmd_info in sorted(_load_csv(path).items()):
+        cat = cmd_info['category'] or 'other'
+        if cat not in by_category:
+            by_category[cat] = []
+        by_category[cat].append(f"- {cmd_info['command']} - {cmd_info['brief']}")
+
+    parts = []
+    for cat in sorted(by_category.keys()):
+        parts.append(f"## {cat.title()}\n")
+        parts.append("\n".join(by_category[cat]))
+        parts.append("\n\n")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _render_command(path, cmd_name):
+    """Markdown documentation of one command of the CSV, rendered on its first lookup"""
+    cmd = _load_csv(path)[cmd_name]
+    parts = [f"# {cmd['command']}\n\n",
+             f"**Category:** {cmd['category']}\n\n",
+             f"**Description:** {cmd['description']}\n\n"]
+    if cmd['usage']:
+        parts.append(f"**Usage:**\n```\n{cmd['usage']}\n```\n\n")
+    if cmd['examples']:
+        parts.append(f"**Examples:**\n```\n{cmd['examples']}\n```\n")
+    return "".join(parts)
+
+
+NGRAM = 3
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _edit_distance(a, b):
+    """Levenshtein distance between a and b"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class _BKTree:
+    """
+    Burkhard-Keller tree of words under edit distance.
+    Finds the words close to a query while skipping the subtrees the triangle inequality rules out.
+    """
+    def __init__(self, words):
+        self._root = None # (word, {distance to word: child node})
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = _edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def find(self, word, max_distance):
+        """List of (distance, word) for the words within max_distance of word"""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_word, children = stack.pop()
+            distance = _edit_distance(word, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            for child_distance, child in children.items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        return found
+
+
+def _max_typo_distance(length):
+    # Short names are within a couple of edits of too many others
+    if length < 3:
+        return 0
+    return 1 if length == 3 else 2
+
+
+@lru_cache(maxsize=8)
+def _suggestion_index(path):
+    """
+    Position of each command in the CSV (suggestions keep the file order), an inverted
+    index of command name 3-grams and a BK-tree of the names, built once so misses
+    don't scan every command.
+    """
+    positions = {}
+    ngram_index = {}
+    for i, cmd_name in enumerate(_load_csv(path)):
+        positions[cmd_name] = i
+        for gram in _ngrams(cmd_name):
+            ngram_index.setdefault(gram, set()).add(cmd_name)
+    return positions, ngram_index, _BKTree(positions)
+
+
+def _suggest(path, command):
+    """
+    Commands whose name contains command or is contained in it, in CSV order,
+    followed by the names a typo away from command (e.g. nmpa -> nmap), closest first.
+    """
+    positions, ngram_index, bk_tree = _suggestion_index(path)
+    if len(command) < NGRAM:
+        matches = {cmd for cmd in positions if command in cmd}
+    else:
+        # A name containing command contains all of its 3-grams
+        candidates = set.intersection(*(ngram_index.get(gram, set()) for gram in _ngrams(command)))
+        matches = {cmd for cmd in candidates if command in cmd}
+    # Names contained in command are substrings of it, there are few of those to try
+    matches.update(command[i:j] for i in range(len(command))
+                   for j in range(i + 1, len(command) + 1) if command[i:j] in positions)
+    suggestions = sorted(matches, key=positions.__getitem__)
+
+    max_distance = _max_typo_distance(len(command))
+    if max_distance:
+        typos = sorted((distance, positions[cmd]) for distance, cmd in bk_tree.find(command, max_distance)
+                       if cmd not in matches)
+        names = list(positions)
+        suggestions.extend(names[i] for _, i in typos)
+    return suggestions
+
 
 class ListCommandsTool(Tool):
     """Tool to list all available security commands with brief descriptions."""
@@ -15,9 +216,7 @@ class ListCommandsTool(Tool):
     PARAMETERS = {}
     REQUIRED_PARAMETERS = set()
     
-    # Default path to the documentation CSV
-    # Path: tools/lookup.py -> nyuctf_multiagent/ -> ctf-agents/ -> docker/kali/
-    DEFAULT_CSV_PATH = Path(__file__).parent.parent.parent / "docker" / "kali" / "commands_documentation.csv"
+    DEFAULT_CSV_PATH = DEFAULT_CSV_PATH
     
     def __init__(self, environment=None, csv_path=None):
         super().__init__()
@@ -26,27 +225,10 @@ class ListCommandsTool(Tool):
     
     def _load_commands(self):
         """Load commands from CSV file."""
-        if self._commands is not None:
-            return self._commands
-        
-        self._commands = {}
-        if not os.path.exists(self.csv_path):
-            return self._commands
-        
-        try:
-            with open(self.csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cmd_name = row.get('command', '').strip().lower()
-                    if cmd_name:
-                        self._commands[cmd_name] = {
-                            'command': row.get('command', '').strip(),
-                            'category': row.get('category', '').strip(),
-                            'brief': row.get('brief', '').strip(),
-                        }
-        except Exception:
-            pass
-        
+        if self._commands is None:
+            # Resolved so every spelling of the same path shares the process-wide cache
+            self._csv_key = str(Path(self.csv_path).resolve())
+            self._commands = _load_csv(self._csv_key)
         return self._commands
     
     def call(self):
@@ -55,20 +237,7 @@ class ListCommandsTool(Tool):
         if not commands:
             return {"error": "Commands list not available."}
         
-        # Group by category
-        by_category = {}
-        for cmd_name, cmd_info in sorted(commands.items()):
-            cat = cmd_info['category'] or 'other'
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append(f"- {cmd_info['command']} - {cmd_info['brief']}")
-        
-        result = ""
-        for cat in sorted(by_category.keys()):
-            result += f"## {cat.title()}\n"
-            result += "\n".join(by_category[cat]) + "\n\n"
-        
-        return {"commands": result}
+        return {"commands": _render_list(self._csv_key)}
     
     def print_tool_call(self, tool_call):
         logger.assistant_action(f"**{self.NAME}**")
@@ -77,7 +246,7 @@ class ListCommandsTool(Tool):
         if "error" in tool_result.result:
             logger.print(f"[bold]{self.NAME}[/bold]: [red]{tool_result.result['error']}[/red]", markup=True)
         else:
-            logger.print(f"[bold]{self.NAME}[/bold]: Listed {len(self._load_commands())} commands", markup=True)
+            logger.print(f"[bold]{self.NAME}[/bold]: Listed {len(self._commands or ())} commands", markup=True)
 
 
 class LookupCommandTool(Tool):
@@ -92,9 +261,7 @@ Pass the command name to get its documentation (e.g., "nmap", "sqlmap", "john").
     }
     REQUIRED_PARAMETERS = {"command"}
     
-    # Default path to the documentation CSV
-    # Path: tools/lookup.py -> nyuctf_multiagent/ -> ctf-agents/ -> docker/kali/
-    DEFAULT_CSV_PATH = Path(__file__).parent.parent.parent / "docker" / "kali" / "commands_documentation.csv"
+    DEFAULT_CSV_PATH = DEFAULT_CSV_PATH
     
     def __init__(self, environment=None, csv_path=None):
         super().__init__()
@@ -103,31 +270,10 @@ Pass the command name to get its documentation (e.g., "nmap", "sqlmap", "john").
     
     def _load_commands(self):
         """Load commands from CSV file."""
-        if self._commands is not None:
-            return self._commands
-        
-        self._commands = {}
-        if not os.path.exists(self.csv_path):
-            logger.print(f"[yellow]Warning: Commands documentation not found at {self.csv_path}[/yellow]", markup=True)
-            return self._commands
-        
-        try:
-            with open(self.csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cmd_name = row.get('command', '').strip().lower()
-                    if cmd_name:
-                        self._commands[cmd_name] = {
-                            'command': row.get('command', '').strip(),
-                            'category': row.get('category', '').strip(),
-                            'brief': row.get('brief', '').strip(),
-                            'description': row.get('description', '').strip(),
-                            'usage': row.get('usage', '').strip(),
-                            'examples': row.get('examples', '').strip(),
-                        }
-        except Exception as e:
-            logger.print(f"[red]Error loading commands documentation: {e}[/red]", markup=True)
-        
+        if self._commands is None:
+            # Resolved so every spelling of the same path shares the process-wide cache
+            self._csv_key = str(Path(self.csv_path).resolve())
+            self._commands = _load_csv(self._csv_key)
         return self._commands
     
     def call(self, command=None):
@@ -142,18 +288,10 @@ Pass the command name to get its documentation (e.g., "nmap", "sqlmap", "john").
         
         # Look up specific command
         if command in commands:
-            cmd = commands[command]
-            result = f"# {cmd['command']}\n\n"
-            result += f"**Category:** {cmd['category']}\n\n"
-            result += f"**Description:** {cmd['description']}\n\n"
-            if cmd['usage']:
-                result += f"**Usage:**\n```\n{cmd['usage']}\n```\n\n"
-            if cmd['examples']:
-                result += f"**Examples:**\n```\n{cmd['examples']}\n```\n"
-            return {"documentation": result}
+            return {"documentation": _render_command(self._csv_key, command)}
         
         # Fuzzy match - suggest similar commands
-        suggestions = [cmd for cmd in commands.keys() if command in cmd or cmd in command]
+        suggestions = _suggest(self._csv_key, command)
         if suggestions:
             return {
                 "error": f"Command '{command}' not found.",
@@ -1,9 +1,9 @@
 from pathlib import Path
-import json
 import re
 import subprocess
 
 from .tool import Tool
+from .. import jsonutils
 from ..logging import logger
 
 DECOMPILE = "/opt/ghidra/customScripts/decompile.sh"
@@ -48,7 +48,8 @@ class GhidraBaseTool(Tool):
             logger.debug_message("GHIDRA FAILED!!")
             logger.debug_message(res.stdout.decode("utf-8"))
             return None
-        out = json.loads(res.stdout.decode("utf-8"))
+        # Whole-binary decompilations are large, parse the raw bytes without decoding to str first
+        out = jsonutils.loads(res.stdout)
         # logger.debug_message("\n".join(out["functions"].keys()))
         return out
 
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cache
 
+from .. import jsonutils
 from ..logging import logger
 
 class Tool:
@@ -12,6 +14,24 @@ class Tool:
     PARAMETERS: dict[str,tuple[str,str]] # Parameters of this model with type and usage explanation
     REQUIRED_PARAMETERS: set[str] # Required parameters
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Precompute the lookups used when validating tool call arguments
+        params = getattr(cls, "PARAMETERS", {})
+        cls._required = frozenset(getattr(cls, "REQUIRED_PARAMETERS", ()))
+        cls._allowed = frozenset(params)
+        cls._number_params = tuple(p for p, (ty, *_) in params.items() if ty == "number")
+
+    @classmethod
+    @cache
+    def parameters_schema(cls):
+        """JSON schema of the parameters, built once per tool class and shared by all backends. Do not mutate."""
+        return {
+            "type": "object",
+            "properties": {n: {"type": p[0], "description": p[1]} for n, p in cls.PARAMETERS.items()},
+            "required": sorted(cls.REQUIRED_PARAMETERS), # Sorted so the schema is byte-identical across processes
+        }
+
     def __init__(self):
         pass
 
@@ -39,6 +59,17 @@ class ToolCall:
         self.parsed_arguments = parsed_arguments
         # Gemini 3 models require thought_signature to be preserved for function calling
         self.thought_signature = thought_signature
+        self._decoded = None # (arguments, decoded arguments)
+
+    @property
+    def decoded_arguments(self):
+        """Arguments as sent by the model, with a JSON string decoded once and memoized"""
+        args = self.arguments
+        if not isinstance(args, str):
+            return args
+        if self._decoded is None or self._decoded[0] is not args:
+            self._decoded = (args, jsonutils.loads(args))
+        return self._decoded[1]
 
     def error(self, message):
         return ToolResult(self.name, self.id, {"error": message})
@@ -74,6 +105,14 @@ class ToolResult:
     """The ID of the tool call"""
     result : object
     """The result of running the tool"""
+    serialized : str = field(default=None, repr=False, compare=False)
+    """JSON encoding of the result, memoized by to_json"""
+
+    def to_json(self):
+        """JSON encoding of the result, computed once since the observation is resent every turn"""
+        if self.serialized is None:
+            self.serialized = jsonutils.dumps(self.result)
+        return self.serialized
 
     @staticmethod
     def error_for_call(tool_call, error):
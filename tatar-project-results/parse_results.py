@@ -14,12 +14,23 @@ Usage:
 """
 
 import json
+import os
 import re
 import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
+from typing import Optional
 
 from nyuctf.dataset import CTFDataset
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ── Category mapping from challenge-name abbreviation ────────────────
 CAT_MAP = {
     "cry": "crypto",
@@ -123,11 +134,15 @@ def is_valid_challenge_name(name: str) -> bool:
     return len(challenge_part) > 0
 
 
+@lru_cache(maxsize=4096)
 def extract_category(challenge_name: str) -> str:
-    """Extract category from challenge name like '2017f-cry-ecxor' → 'crypto'."""
-    parts = challenge_name.split("-")
-    if len(parts) >= 2:
-        abbrev = parts[1]
+    """Extract category from challenge name like '2017f-cry-ecxor' → 'crypto'.
+
+    Cached: the same benchmark names are categorized for every experiment.
+    """
+    _, sep, rest = challenge_name.partition("-")
+    if sep:
+        abbrev = rest.partition("-")[0]
         return CAT_MAP.get(abbrev, "unknown")
     return "unknown"
 
@@ -136,6 +151,99 @@ def extract_category(challenge_name: str) -> str:
 # Data-source readers
 # ─────────────────────────────────────────────────────────────────────
 
+COST_RE = re.compile(r"cost:\s*\$?([\d.]+)")
+COST_BYTES_RE = re.compile(rb"cost:\s*\$?([\d.]+)")
+BATCH_TAIL_BYTES = 4096
+
+
+def read_log_tail(log_file: Path) -> bytes:
+    """Last BATCH_TAIL_BYTES of a batch log, where the outcome markers are.
+
+    Kept as bytes: the markers are ASCII, so the tail needs no decoding.
+    """
+    with open(log_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > BATCH_TAIL_BYTES:
+            f.seek(size - BATCH_TAIL_BYTES)
+        return f.read()
+
+# The readers are memoized per directory: extract_challenge_data and
+# extract_exit_reasons read the same sources, and RQ4 reuses RQ3 directories.
+# Callers must not mutate the returned dicts.
+
+
+def load_json_file(path) -> object:
+    """Parse a JSON file, with orjson when it is installed.
+
+    Falls back to the stdlib parser for what orjson rejects (e.g. NaN).
+    Raises json.JSONDecodeError or OSError like json.load.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+# The agents write jupyter logs with json.dump(..., indent=2) and the summary
+# fields first, so they are lines at the first indentation level near the top.
+# Nested dicts (e.g. tool results with "success") are indented deeper.
+JUPYTER_SUMMARY_FIELDS = ("success", "total_cost", "time_taken", "exit_reason")
+JUPYTER_SUMMARY_RE = re.compile(rb'^  "(success|total_cost|time_taken|exit_reason)": (.*?),?\r?$', re.M)
+JUPYTER_HEAD_BYTES = 4096
+
+
+def read_jupyter_summary(path) -> dict:
+    """Read the summary fields of a jupyter log without parsing its trajectory.
+
+    Matches the top-level fields in the head of the file, and checks that the
+    file is complete (ends with the closing brace). Falls back to parsing the
+    whole file for small files and other layouts.
+    Raises json.JSONDecodeError or OSError like load_json_file.
+    """
+    with open(path, "rb") as f:
+        head = f.read(JUPYTER_HEAD_BYTES)
+        size = os.fstat(f.fileno()).st_size
+        if size > len(head):
+            f.seek(max(size - 64, len(head)))
+            complete = f.read().rstrip().endswith(b"}")
+            summary = {}
+            for m in JUPYTER_SUMMARY_RE.finditer(head):
+                summary.setdefault(m.group(1).decode(), m.group(2))
+            if complete and len(summary) == len(JUPYTER_SUMMARY_FIELDS):
+                try:
+                    return {key: json.loads(value) for key, value in summary.items()}
+                except json.JSONDecodeError:
+                    pass
+    return load_json_file(path)
+
+
+JUPYTER_READ_WORKERS = 16
+
+# Shared by every read_jupyter_jsons call, so directories scanned concurrently
+# by scan_experiment_dirs do not each start their own pool
+_jupyter_read_pool = None
+
+
+def jupyter_read_pool() -> ThreadPoolExecutor:
+    """Thread pool for the jupyter log reads, created on first use."""
+    global _jupyter_read_pool
+    if _jupyter_read_pool is None:
+        _jupyter_read_pool = ThreadPoolExecutor(max_workers=JUPYTER_READ_WORKERS)
+    return _jupyter_read_pool
+
+
+def _try_read_jupyter_summary(path) -> Optional[dict]:
+    """read_jupyter_summary, or None for unreadable or malformed logs."""
+    try:
+        return read_jupyter_summary(path)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
 def _parse_filename_timestamp(stem: str) -> int:
     """Extract numeric timestamp from filename stem for recency comparison.
 
@@ -148,6 +256,7 @@ def _parse_filename_timestamp(stem: str) -> int:
     return 0
 
 
+@lru_cache(maxsize=None)
 def read_jupyter_jsons(logs_dir: Path) -> dict[str, dict]:
     """Read per-challenge jupyter JSON files.
 
@@ -166,8 +275,13 @@ def read_jupyter_jsons(logs_dir: Path) -> dict[str, dict]:
     default_dir = jupyter_dir / "default"
     search_dir = default_dir if default_dir.exists() else jupyter_dir
 
-    for json_file in search_dir.glob("*.json"):
-        stem = json_file.stem
+    # scandir yields names without building a Path per entry
+    with os.scandir(search_dir) as entries:
+        json_files = [(entry.name[:-len(".json")], entry.path) for entry in entries
+                      if entry.name.endswith(".json")]
+
+    logs = []
+    for stem, json_file in json_files:
         parts = stem.rsplit("-", 1)
         if len(parts) == 2 and parts[1].isdigit():
             challenge_name = parts[0]
@@ -176,21 +290,23 @@ def read_jupyter_jsons(logs_dir: Path) -> dict[str, dict]:
             challenge_name = stem
             timestamp = 0
 
-        if not is_valid_challenge_name(challenge_name):
-            continue
+        if is_valid_challenge_name(challenge_name):
+            logs.append((challenge_name, timestamp, json_file))
 
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-            info = {
-                "success": data.get("success", False),
-                "total_cost": data.get("total_cost", 0.0),
-                "time_taken": data.get("time_taken", 0.0),
-                "exit_reason": data.get("exit_reason", ""),
-                "_timestamp": timestamp,
-            }
-        except (json.JSONDecodeError, OSError):
+    # Reads are I/O bound, so overlap them across threads; results come back in
+    # order and are merged here, keeping the duplicate handling sequential
+    summaries = jupyter_read_pool().map(_try_read_jupyter_summary, [json_file for _, _, json_file in logs])
+
+    for (challenge_name, timestamp, _), data in zip(logs, summaries):
+        if data is None:
             continue
+        info = {
+            "success": data.get("success", False),
+            "total_cost": data.get("total_cost", 0.0),
+            "time_taken": data.get("time_taken", 0.0),
+            "exit_reason": data.get("exit_reason", ""),
+            "_timestamp": timestamp,
+        }
 
         existing = result.get(challenge_name)
         if existing is None:
@@ -207,6 +323,7 @@ def read_jupyter_jsons(logs_dir: Path) -> dict[str, dict]:
     return result
 
 
+@lru_cache(maxsize=None)
 def read_finished_challenges(logs_dir: Path) -> dict[str, dict]:
     """Parse finishedChallenges.txt if present.
 
@@ -222,48 +339,70 @@ def read_finished_challenges(logs_dir: Path) -> dict[str, dict]:
     if not fc_path.exists():
         return result
 
-    cost_re = re.compile(r"cost:\s*\$?([\d.]+)")
+    # Stream the lines instead of loading the whole file and a list of its lines
+    with open(fc_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
 
-    for line in fc_path.read_text().splitlines():
-        line = line.strip()
-        if not line:
-            continue
+            parts = line.split(" - ", 2)
+            if len(parts) < 2:
+                continue
 
-        parts = line.split(" - ", 2)
-        if len(parts) < 2:
-            continue
+            challenge_name = parts[0].strip()
+            if not is_valid_challenge_name(challenge_name):
+                continue
 
-        challenge_name = parts[0].strip()
-        if not is_valid_challenge_name(challenge_name):
-            continue
+            status = parts[1].strip().upper()
+            rest = parts[2] if len(parts) > 2 else ""
 
-        status = parts[1].strip().upper()
-        rest = parts[2] if len(parts) > 2 else ""
+            # Skip infrastructure failures — these aren't real attempts
+            if status == "FAILED" and ("FAILED TO RUN" in rest.upper() or "KEY_ERROR" in rest.upper()):
+                continue
 
-        # Skip infrastructure failures — these aren't real attempts
-        if status == "FAILED" and ("FAILED TO RUN" in rest.upper() or "KEY_ERROR" in rest.upper()):
-            continue
+            success = status == "SOLVED"
 
-        success = status == "SOLVED"
+            cost = 0.0
+            m = COST_RE.search(rest)
+            if m:
+                try:
+                    cost = float(m.group(1))
+                except ValueError:
+                    pass
 
-        cost = 0.0
-        m = cost_re.search(rest)
-        if m:
-            try:
-                cost = float(m.group(1))
-            except ValueError:
-                pass
-
-        # Keep solved over failed for duplicates
-        if challenge_name not in result or success:
-            result[challenge_name] = {
-                "success": success,
-                "total_cost": cost,
-            }
+            # Keep solved over failed for duplicates
+            if challenge_name not in result or success:
+                result[challenge_name] = {
+                    "success": success,
+                    "total_cost": cost,
+                }
 
     return result
 
 
+def _batch_logs(logs_dir: Path) -> list[tuple[str, str]]:
+    """(challenge name, path) of the batch_*.log files in logs_dir, listed with os.scandir."""
+    with os.scandir(logs_dir) as entries:
+        return [(entry.name[len("batch_"):-len(".log")], entry.path) for entry in entries
+                if entry.name.startswith("batch_") and entry.name.endswith(".log")]
+
+
+def _last_exit_line(tail: bytes) -> Optional[bytes]:
+    """Last line of tail with both "exit:" and "cost:", searched backwards with rfind."""
+    end = len(tail)
+    while (pos := tail.rfind(b"exit:", 0, end)) != -1:
+        # Line breaks as in bytes.splitlines: \n, \r or \r\n
+        start = max(tail.rfind(b"\n", 0, pos), tail.rfind(b"\r", 0, pos)) + 1
+        stop = min((i for i in (tail.find(b"\n", pos), tail.find(b"\r", pos)) if i != -1), default=len(tail))
+        line = tail[start:stop]
+        if b"cost:" in line:
+            return line
+        end = start
+    return None
+
+
+@lru_cache(maxsize=None)
 def read_batch_logs(logs_dir: Path) -> dict[str, dict]:
     """Parse per-challenge batch_*.log files.
 
@@ -273,42 +412,31 @@ def read_batch_logs(logs_dir: Path) -> dict[str, dict]:
     Returns dict of challenge_name → {success, total_cost}.
     """
     result = {}
-    cost_re = re.compile(r"cost:\s*\$?([\d.]+)")
 
-    for log_file in logs_dir.glob("batch_*.log"):
+    for challenge_name, log_file in _batch_logs(logs_dir):
         # Filename: batch_2017f-cry-ecxor.log → challenge_name: 2017f-cry-ecxor
-        stem = log_file.stem
-        if not stem.startswith("batch_"):
-            continue
-        challenge_name = stem[len("batch_"):]
         if not challenge_name:
             continue
 
-        # Read last 2KB to find outcome markers (avoid reading huge files)
+        # Read the tail to find outcome markers (avoid reading huge files)
         try:
-            size = log_file.stat().st_size
-            with open(log_file, "r", errors="replace") as f:
-                if size > 4096:
-                    f.seek(size - 4096)
-                tail = f.read()
+            tail = read_log_tail(log_file)
         except OSError:
             continue
 
-        success = "Challenge Solved!" in tail
+        success = b"Challenge Solved!" in tail
         # Also check for NOT_SOLVED marker if no solved marker found
-        failed = "Challenge Not Solved!" in tail
+        failed = b"Challenge Not Solved!" in tail
 
         cost = 0.0
-        # Find the last "exit:" line in the tail
-        for line in reversed(tail.splitlines()):
-            if "exit:" in line and "cost:" in line:
-                m = cost_re.search(line)
-                if m:
-                    try:
-                        cost = float(m.group(1))
-                    except ValueError:
-                        pass
-                break
+        line = _last_exit_line(tail)
+        if line is not None:
+            m = COST_BYTES_RE.search(line)
+            if m:
+                try:
+                    cost = float(m.group(1))
+                except ValueError:
+                    pass
 
         if success or failed:
             result[challenge_name] = {
@@ -323,10 +451,15 @@ def read_batch_logs(logs_dir: Path) -> dict[str, dict]:
 # Master challenge list
 # ─────────────────────────────────────────────────────────────────────
 
-def build_master_challenge_list() -> list[str]:
-    """Load the canonical list of 200 benchmark challenges from the NYU CTF dataset."""
+def build_master_challenge_list() -> tuple[list[str], Counter]:
+    """Load the canonical list of 200 benchmark challenges from the NYU CTF dataset.
+
+    Also returns the number of challenges per category, the denominators
+    shared by every experiment's stats.
+    """
     ds = CTFDataset(split="test")
-    return sorted(ds.dataset.keys())
+    master_challenges = sorted(ds.dataset.keys())
+    return master_challenges, Counter(map(extract_category, master_challenges))
 
 
 # ─────────────────────────────────────────────────────────────────────
@@ -343,7 +476,8 @@ def extract_challenge_data(logs_dir: Path, master_challenges: list[str]
         3. batch_*.log  (outcome markers at end of files)
 
     Only challenges in master_challenges are included.
-    Any challenge in master_challenges not found in logs is treated as failed.
+    Any challenge in master_challenges not solved in any source (including
+    those not found in the logs) is treated as failed.
 
     Returns:
         completed: list of solved challenge names
@@ -351,39 +485,19 @@ def extract_challenge_data(logs_dir: Path, master_challenges: list[str]
         costs: dict of challenge_name → total_cost (for solved challenges)
     """
     master_set = set(master_challenges)
-    completed_set: set[str] = set()
-    failed_set: set[str] = set()
     costs: dict[str, float] = {}
 
-    def _mark_solved(ch: str, cost: float) -> None:
-        failed_set.discard(ch)
-        completed_set.add(ch)
-        costs[ch] = cost
-
-    def _mark_failed(ch: str) -> None:
-        if ch not in completed_set:
-            failed_set.add(ch)
-
-    def _apply_source(data: dict[str, dict]) -> None:
-        for ch, info in data.items():
-            if ch not in master_set:
-                continue
-            if info["success"]:
-                _mark_solved(ch, info.get("total_cost", 0.0))
-            elif ch not in completed_set and ch not in failed_set:
-                _mark_failed(ch)
-
-    # Sources in priority order — solved in any source wins
-    _apply_source(read_jupyter_jsons(logs_dir))
-    _apply_source(read_finished_challenges(logs_dir))
-    _apply_source(read_batch_logs(logs_dir))
-
-    # Pad missing benchmark challenges as failed
-    for ch in master_challenges:
-        if ch not in completed_set and ch not in failed_set:
-            failed_set.add(ch)
+    # Sources in priority order — solved in any source wins, and a later
+    # source that also reports the solve sets the cost
+    for source in (read_jupyter_jsons(logs_dir),
+                   read_finished_challenges(logs_dir),
+                   read_batch_logs(logs_dir)):
+        for ch, info in source.items():
+            if info["success"] and ch in master_set:
+                costs[ch] = info.get("total_cost", 0.0)
 
-    return sorted(completed_set), sorted(failed_set), costs
+    # Everything else, reported as failed or missing from the logs, is failed
+    return sorted(costs), sorted(master_set.difference(costs)), costs
 
 
 EXIT_REASON_MAP = {
@@ -396,7 +510,7 @@ EXIT_REASON_MAP = {
 EXIT_REASON_ORDER = ["Solved", "MaxCost", "MaxRound", "Timeout", "Gave Up", "Error/Bug", "Not Attempted"]
 
 
-BATCH_EXIT_RE = re.compile(r"exit:\s*(\S+)\s+cost:")
+BATCH_EXIT_RE = re.compile(rb"exit:\s*(\S+)\s+cost:")
 FAILED_CHALLENGE_RE = re.compile(r"^([^:]+):(\S+)$")
 
 FAILED_TXT_MAP = {
@@ -427,50 +541,46 @@ def extract_exit_reasons(logs_dir: Path, master_challenges: list[str]) -> dict[s
         per_challenge[ch] = EXIT_REASON_MAP.get(raw, "Error/Bug")
 
     # Source 2: batch log exit lines
-    cost_re = re.compile(r"cost:\s*\$?([\d.]+)")
-    for log_file in logs_dir.glob("batch_*.log"):
-        ch = log_file.stem[len("batch_"):]
+    for ch, log_file in _batch_logs(logs_dir):
         if ch not in master_set or ch in per_challenge:
             continue
         try:
-            size = log_file.stat().st_size
-            with open(log_file, "r", errors="replace") as f:
-                if size > 4096:
-                    f.seek(size - 4096)
-                tail = f.read()
+            tail = read_log_tail(log_file)
         except OSError:
             continue
 
         for line in reversed(tail.splitlines()):
             m = BATCH_EXIT_RE.search(line)
             if m:
-                raw = m.group(1)
+                raw = m.group(1).decode(errors="replace")
                 per_challenge[ch] = EXIT_REASON_MAP.get(raw, "Error/Bug")
                 break
         else:
-            if "Challenge Solved!" in tail:
+            if b"Challenge Solved!" in tail:
                 per_challenge[ch] = "Solved"
 
     # Source 3: failed_challenges.txt
     failed_path = logs_dir / "failed_challenges.txt"
     if failed_path.exists():
-        for line in failed_path.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            m = FAILED_CHALLENGE_RE.match(line)
-            if m:
-                ch, code = m.group(1), m.group(2)
-                if ch in master_set and ch not in per_challenge:
-                    per_challenge[ch] = FAILED_TXT_MAP.get(code, "Error/Bug")
+        with open(failed_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                m = FAILED_CHALLENGE_RE.match(line)
+                if m:
+                    ch, code = m.group(1), m.group(2)
+                    if ch in master_set and ch not in per_challenge:
+                        per_challenge[ch] = FAILED_TXT_MAP.get(code, "Error/Bug")
 
     # Source 4: completed_challenges.txt
     completed_path = logs_dir / "completed_challenges.txt"
     if completed_path.exists():
-        for line in completed_path.read_text().splitlines():
-            ch = line.strip()
-            if ch in master_set and ch not in per_challenge:
-                per_challenge[ch] = "Solved"
+        with open(completed_path) as f:
+            for line in f:
+                ch = line.strip()
+                if ch in master_set and ch not in per_challenge:
+                    per_challenge[ch] = "Solved"
 
     counts: dict[str, int] = {r: 0 for r in EXIT_REASON_ORDER}
     for ch in master_challenges:
@@ -481,28 +591,19 @@ def extract_exit_reasons(logs_dir: Path, master_challenges: list[str]) -> dict[s
 
 def compute_stats(completed: list[str], failed: list[str],
                   costs: dict[str, float],
-                  master_challenges: list[str]) -> dict:
+                  master_challenges: list[str], cat_total: Counter) -> dict:
     """Compute solve stats for one experiment setup.
 
-    Uses master_challenges for per-category totals so that the
-    denominator is always the full 200 challenges.
+    Uses master_challenges and its per-category totals (cat_total, from
+    build_master_challenge_list) so that the denominator is always the
+    full 200 challenges.
     """
     total = len(master_challenges)
     solved = len(completed)
 
-    # Per-category totals from master list
-    cat_total = {c: 0 for c in CATEGORY_ORDER}
-    for ch in master_challenges:
-        cat = extract_category(ch)
-        if cat in cat_total:
-            cat_total[cat] += 1
-
-    # Per-category solved from actual results
-    cat_solved = {c: 0 for c in CATEGORY_ORDER}
-    for ch in completed:
-        cat = extract_category(ch)
-        if cat in cat_solved:
-            cat_solved[cat] += 1
+    # Per-category solved from actual results.
+    # Counter tallies in C; categories outside CATEGORY_ORDER are never read
+    cat_solved = Counter(map(extract_category, completed))
 
     by_category = {}
     for cat in CATEGORY_ORDER:
@@ -530,26 +631,48 @@ def compute_stats(completed: list[str], failed: list[str],
     return {"overall": overall, "by_category": by_category}
 
 
-def parse_rq1_rq2(results_dir: Path, master_challenges: list[str]) -> dict:
+def _scan_experiment_dir(logs_dir: Path, master_challenges: list[str]) -> tuple:
+    """Read one exp-logs dir: (completed, failed, costs, exit_reasons)."""
+    completed, failed, costs = extract_challenge_data(logs_dir, master_challenges)
+    return completed, failed, costs, extract_exit_reasons(logs_dir, master_challenges)
+
+
+def scan_experiment_dirs(logs_dirs: list[Path], master_challenges: list[str]) -> list[tuple]:
+    """Scan independent exp-logs dirs concurrently in threads.
+
+    Threads keep the readers' lru_caches in this process, so later lookups of the
+    same dirs (e.g. the RQ3 baselines in parse_rq4) are served from memory.
+    Returns the _scan_experiment_dir results in the order of logs_dirs.
+    """
+    if len(logs_dirs) < 2:
+        return [_scan_experiment_dir(d, master_challenges) for d in logs_dirs]
+    with ThreadPoolExecutor(max_workers=len(logs_dirs)) as pool:
+        return list(pool.map(_scan_experiment_dir, logs_dirs, repeat(master_challenges)))
+
+
+def parse_rq1_rq2(results_dir: Path, master_challenges: list[str], cat_total: Counter) -> dict:
     """Parse all RQ1_RQ2 experiment results from exp-logs-* directories."""
     rq_dir = results_dir / "RQ1_RQ2"
     conditions = {}
 
-    for logs_subdir in sorted(rq_dir.glob("exp-logs-*")):
+    logs_subdirs = sorted(rq_dir.glob("exp-logs-*"))
+    scans = iter(scan_experiment_dirs(
+        [d for d in logs_subdirs if d.name.replace("exp-logs-", "") in RQ1_RQ2_SETUPS], master_challenges))
+
+    for logs_subdir in logs_subdirs:
         suffix = logs_subdir.name.replace("exp-logs-", "")
         if suffix not in RQ1_RQ2_SETUPS:
             print(f"  ⚠ Unknown RQ1_RQ2 suffix: {suffix}, skipping")
             continue
 
         meta = RQ1_RQ2_SETUPS[suffix]
-        completed, failed, costs = extract_challenge_data(logs_subdir, master_challenges)
+        completed, failed, costs, exit_reasons = next(scans)
 
         if not completed and not failed:
             print(f"  ⚠ {meta['label']}: no challenge data found, skipping")
             continue
 
-        stats = compute_stats(completed, failed, costs, master_challenges)
-        exit_reasons = extract_exit_reasons(logs_subdir, master_challenges)
+        stats = compute_stats(completed, failed, costs, master_challenges, cat_total)
         key = meta["key"]
         conditions[key] = {
             "label": meta["label"],
@@ -572,7 +695,7 @@ def parse_rq1_rq2(results_dir: Path, master_challenges: list[str]) -> dict:
     }
 
 
-def parse_rq3(results_dir: Path, master_challenges: list[str]) -> dict:
+def parse_rq3(results_dir: Path, master_challenges: list[str], cat_total: Counter) -> dict:
     """Parse all RQ3 experiment results from exp-logs-* directories.
 
     Deduplicates by model name: if multiple dir suffixes map to the same
@@ -581,21 +704,24 @@ def parse_rq3(results_dir: Path, master_challenges: list[str]) -> dict:
     rq_dir = results_dir / "RQ3"
     models_by_name: dict[str, dict] = {}
 
-    for logs_subdir in sorted(rq_dir.glob("exp-logs-*")):
+    logs_subdirs = sorted(rq_dir.glob("exp-logs-*"))
+    scans = iter(scan_experiment_dirs(
+        [d for d in logs_subdirs if d.name.replace("exp-logs-", "") in RQ3_MODELS], master_challenges))
+
+    for logs_subdir in logs_subdirs:
         suffix = logs_subdir.name.replace("exp-logs-", "")
         if suffix not in RQ3_MODELS:
             print(f"  ⚠ Unknown RQ3 suffix: {suffix}, skipping")
             continue
 
         meta = RQ3_MODELS[suffix]
-        completed, failed, costs = extract_challenge_data(logs_subdir, master_challenges)
+        completed, failed, costs, exit_reasons = next(scans)
 
         if not completed and not failed:
             print(f"  ⚠ {meta['name']}: no challenge data found, skipping")
             continue
 
-        stats = compute_stats(completed, failed, costs, master_challenges)
-        exit_reasons = extract_exit_reasons(logs_subdir, master_challenges)
+        stats = compute_stats(completed, failed, costs, master_challenges, cat_total)
         by_cat_flat = {cat: stats["by_category"][cat]["solve_rate"]
                        for cat in CATEGORY_ORDER}
 
@@ -627,7 +753,7 @@ def parse_rq3(results_dir: Path, master_challenges: list[str]) -> dict:
     }
 
 
-def parse_rq4(results_dir: Path, master_challenges: list[str]) -> dict:
+def parse_rq4(results_dir: Path, master_challenges: list[str], cat_total: Counter) -> dict:
     """Parse RQ4 experiment results: multi-agent architecture combos.
 
     Also pulls the same-model baselines from RQ3 (gemini3_pro, gemini3_flash)
@@ -651,7 +777,7 @@ def parse_rq4(results_dir: Path, master_challenges: list[str]) -> dict:
                 print(f"  ⚠ {meta['label']}: no challenge data found, skipping")
                 continue
 
-            stats = compute_stats(completed, failed, costs, master_challenges)
+            stats = compute_stats(completed, failed, costs, master_challenges, cat_total)
             key = meta["key"]
             conditions[key] = {
                 "label": meta["label"],
@@ -672,7 +798,7 @@ def parse_rq4(results_dir: Path, master_challenges: list[str]) -> dict:
         completed, failed, costs = extract_challenge_data(baseline_dir, master_challenges)
         if not completed:
             continue
-        stats = compute_stats(completed, failed, costs, master_challenges)
+        stats = compute_stats(completed, failed, costs, master_challenges, cat_total)
         conditions[f"baseline_{suffix}"] = {
             "label": label,
             "planner": RQ3_MODELS[suffix]["name"],
@@ -692,7 +818,7 @@ def parse_rq4(results_dir: Path, master_challenges: list[str]) -> dict:
     }
 
 
-def parse_rq5(results_dir: Path, master_challenges: list[str]) -> dict:
+def parse_rq5(results_dir: Path, master_challenges: list[str], cat_total: Counter) -> dict:
     """Parse RQ5 reproducibility results: multiple runs of the same config.
 
     Expects either:
@@ -717,7 +843,7 @@ def parse_rq5(results_dir: Path, master_challenges: list[str]) -> dict:
         if not completed and not failed:
             continue
 
-        stats = compute_stats(completed, failed, costs, master_challenges)
+        stats = compute_stats(completed, failed, costs, master_challenges, cat_total)
         by_cat_flat = {cat: stats["by_category"][cat]["solve_rate"]
                        for cat in CATEGORY_ORDER}
         runs.append({
@@ -744,8 +870,7 @@ def parse_rq5(results_dir: Path, master_challenges: list[str]) -> dict:
                 else:
                     ch = stem
                 try:
-                    with open(json_file) as f:
-                        data = json.load(f)
+                    data = load_json_file(json_file)
                     per_challenge[ch].append(data.get("success", False))
                 except (json.JSONDecodeError, OSError):
                     pass
@@ -766,6 +891,16 @@ def parse_rq5(results_dir: Path, master_challenges: list[str]) -> dict:
     }
 
 
+def write_json(path: Path, obj) -> None:
+    """Write obj with json.dump(indent=2).
+
+    Not orjson: it writes non-ASCII unescaped, NaN as null and floats in its own
+    repr, so the output files would change.
+    """
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse D-CIPHER experiment results from logs")
     parser.add_argument("--results-dir", default="tatar-project-results/results",
@@ -784,17 +919,16 @@ def main():
 
     # ── Build master challenge list ──
     print("\n🔍 Building master challenge list...")
-    master_challenges = build_master_challenge_list()
+    master_challenges, cat_total = build_master_challenge_list()
     print(f"  Found {len(master_challenges)} unique challenges")
 
     # ── RQ1+RQ2 ──
     rq_dir = results_dir / "RQ1_RQ2"
     if rq_dir.exists():
         print("\n📊 Parsing RQ1+RQ2 results from logs...")
-        rq12 = parse_rq1_rq2(results_dir, master_challenges)
+        rq12 = parse_rq1_rq2(results_dir, master_challenges, cat_total)
         out_path = output_dir / "rq1_rq2_combined.json"
-        with open(out_path, "w") as f:
-            json.dump(rq12, f, indent=2)
+        write_json(out_path, rq12)
         print(f"\n  → Wrote {out_path} ({len(rq12['conditions'])} conditions)")
     else:
         print(f"\n⚠ RQ1_RQ2 directory not found at {rq_dir}")
@@ -803,10 +937,9 @@ def main():
     rq_dir = results_dir / "RQ3"
     if rq_dir.exists():
         print("\n📊 Parsing RQ3 results from logs...")
-        rq3 = parse_rq3(results_dir, master_challenges)
+        rq3 = parse_rq3(results_dir, master_challenges, cat_total)
         out_path = output_dir / "rq3_models.json"
-        with open(out_path, "w") as f:
-            json.dump(rq3, f, indent=2)
+        write_json(out_path, rq3)
         print(f"\n  → Wrote {out_path} ({len(rq3['models'])} models)")
     else:
         print(f"\n⚠ RQ3 directory not found at {rq_dir}")
@@ -816,11 +949,10 @@ def main():
     rq3_dir = results_dir / "RQ3"
     if rq4_dir.exists() or rq3_dir.exists():
         print("\n📊 Parsing RQ4 results (multi-agent architecture)...")
-        rq4 = parse_rq4(results_dir, master_challenges)
+        rq4 = parse_rq4(results_dir, master_challenges, cat_total)
         if rq4["conditions"]:
             out_path = output_dir / "rq4_architecture.json"
-            with open(out_path, "w") as f:
-                json.dump(rq4, f, indent=2)
+            write_json(out_path, rq4)
             print(f"\n  → Wrote {out_path} ({len(rq4['conditions'])} conditions)")
         else:
             print("\n  ⚠ No RQ4 results yet (waiting for experiment data)")
@@ -829,11 +961,10 @@ def main():
     rq5_dir = results_dir / "RQ5"
     if rq5_dir.exists():
         print("\n📊 Parsing RQ5 results (reproducibility)...")
-        rq5 = parse_rq5(results_dir, master_challenges)
+        rq5 = parse_rq5(results_dir, master_challenges, cat_total)
         if rq5["runs"]:
             out_path = output_dir / "rq5_reproducibility.json"
-            with open(out_path, "w") as f:
-                json.dump(rq5, f, indent=2)
+            write_json(out_path, rq5)
             print(f"\n  → Wrote {out_path} ({len(rq5['runs'])} runs)")
         else:
             print("\n  ⚠ No RQ5 results yet (waiting for experiment data)")
@@ -10,15 +10,31 @@ Usage:
 """
 
 import json
+import hashlib
+import functools
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
+import matplotlib
+matplotlib.use("Agg")  # Plots are only written to files, never shown
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
-from matplotlib.colors import Normalize, PowerNorm
+from matplotlib.colors import ListedColormap, NoNorm, Normalize, PowerNorm, to_hex
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+from matplotlib.transforms import ScaledTranslation
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ── Global font sizes for paper-ready single-column plots ────────────
+plt.ioff()
 plt.rcParams.update({
     'font.size': 14,
     'axes.titlesize': 18,
@@ -32,6 +48,12 @@ plt.rcParams.update({
 
 # ── Styling ──────────────────────────────────────────────────────────
 CATEGORY_ORDER = ["crypto", "forensics", "misc", "pwn", "reverse", "web"]
+CATEGORY_LABELS = tuple(c.capitalize() for c in CATEGORY_ORDER)
+
+# Header rows of the table-style heatmaps
+RQ12_HEADER = ("OS", "Tips", "AP") + CATEGORY_LABELS + ("Overall",)
+RQ3_HEADER = ("Model",) + CATEGORY_LABELS + ("Overall",)
+RQ4_HEADER = ("Configuration",) + CATEGORY_LABELS + ("Overall",)
 
 CONDITION_COLORS = {
     "ubuntu_generic":            "#F4A460",
@@ -59,26 +81,82 @@ PALETTE = {
 
 
 def load_json(path: str) -> dict:
-    with open(path) as f:
-        return json.load(f)
+    """Parse a JSON file, with orjson when it is installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN, which only the stdlib parser accepts
+    return json.loads(raw)
+
+
+def load_json_if_exists(path: Path) -> Optional[dict]:
+    return load_json(path) if path.exists() else None
+
+
+# The figures are regenerated on every run, favour encoding speed over the last few percent of PNG size
+PNG_COMPRESS_LEVEL = 3
+
+
+# Subplot parameters a new Figure takes from rcParams, restored on a recycled one
+SUBPLOT_PARAMS = ("left", "right", "bottom", "top", "wspace", "hspace")
+
+
+def subplots(fig: Figure, figsize):
+    """plt.subplots(figsize=figsize), or fig reset to a new Figure's state and resized when one is passed."""
+    if fig is None:
+        return plt.subplots(figsize=figsize)
+    # clear() drops the axes, legends, texts and suptitle, but the subplot parameters
+    # left by the previous plot's tight_layout and its layout engine survive it
+    fig.clear()
+    fig.set_layout_engine(None)
+    fig.subplots_adjust(**{k: plt.rcParams[f"figure.subplot.{k}"] for k in SUBPLOT_PARAMS})
+    fig.set_size_inches(figsize)
+    return fig, fig.add_subplot()
+
+
+def label_cells(ax, labels, fontsize, fontweight="normal", alpha=None):
+    """Draw (x, y, text, color) labels centered on data points, one ax.text each."""
+    for x, y, txt, color in labels:
+        ax.text(x, y, txt, ha="center", va="center",
+                fontsize=fontsize, fontweight=fontweight, color=color, alpha=alpha)
+
+
+def save_figure(fig, path: Path):
+    """Save fig as a PNG, close it (a no-op for a recycled Figure outside pyplot) and report the path."""
+    fig.savefig(path, dpi=200, bbox_inches="tight",
+                pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL, "optimize": False})
+    plt.close(fig)
+    print(f"  ✓ {path}")
+
+
+def fill_cells(ax, x_edges, y_edges, colors, **kwargs):
+    """Fill a grid of table cells with a 2D list of colors, drawn as one QuadMesh."""
+    palette = list(dict.fromkeys(c for row in colors for c in row))
+    index = {c: i for i, c in enumerate(palette)}
+    codes = np.array([[index[c] for c in row] for row in colors])
+    return ax.pcolormesh(x_edges, y_edges, codes, cmap=ListedColormap(palette), norm=NoNorm(),
+                         antialiased=True, rasterized=True, **kwargs)
 
 
 # =====================================================================
 # RQ1+RQ2 CHART 1: All available conditions — overall solve rate bar
 # =====================================================================
-def rq1rq2_all_conditions_bar(data: dict, out: Path):
+def rq1rq2_all_conditions_bar(data: dict, out: Path, fig: Figure = None):
     """Bar chart comparing all available conditions, sorted by solve rate."""
     conds = data["conditions"]
     if not conds:
         print("  ⚠ No conditions available, skipping all_conditions_bar")
         return
 
-    sorted_keys = sorted(conds.keys(), key=lambda k: conds[k]["overall"]["solve_rate"])
-    labels = [conds[k]["label"] for k in sorted_keys]
-    rates  = [conds[k]["overall"]["solve_rate"] * 100 for k in sorted_keys]
-    colors = [CONDITION_COLORS.get(k, "#888") for k in sorted_keys]
+    entries = sorted(conds.items(), key=lambda kv: kv[1]["overall"]["solve_rate"])
+    labels = [c["label"] for _, c in entries]
+    rates  = [c["overall"]["solve_rate"] * 100 for _, c in entries]
+    colors = [CONDITION_COLORS.get(k, "#888") for k, _ in entries]
 
-    fig, ax = plt.subplots(figsize=(12, max(4, len(labels) * 0.8)))
+    fig, ax = subplots(fig, figsize=(12, max(4, len(labels) * 0.8)))
     bars = ax.barh(labels, rates, color=colors, edgecolor="white", linewidth=1, height=0.65, zorder=3)
 
     ax.set_xlabel("Solve Rate (%)", fontsize=15, fontweight="bold")
@@ -91,16 +169,12 @@ def rq1rq2_all_conditions_bar(data: dict, out: Path):
     ax.spines["right"].set_visible(False)
 
     total = data.get("total_challenges", 200)
-    for bar, rate, key in zip(bars, rates, sorted_keys):
-        solved = conds[key]["overall"]["solved"]
-        ax.text(bar.get_width() + 0.4, bar.get_y() + bar.get_height()/2,
-                f"{rate:.1f}%  ({solved}/{total})", va="center", fontsize=13,
-                fontweight="bold", color="#333")
+    ax.bar_label(bars, labels=[f"{rate:.1f}%  ({c['overall']['solved']}/{total})"
+                               for rate, (_, c) in zip(rates, entries)],
+                 padding=4, fontsize=13, fontweight="bold", color="#333")
 
     fig.tight_layout()
-    fig.savefig(out / "rq1rq2_all_conditions.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq1rq2_all_conditions.png'}")
+    save_figure(fig, out / "rq1rq2_all_conditions.png")
 
 
 # =====================================================================
@@ -118,7 +192,7 @@ EXIT_REASON_COLORS = {
 }
 
 
-def rq1rq2_exit_reasons(data: dict, out: Path):
+def rq1rq2_exit_reasons(data: dict, out: Path, fig: Figure = None):
     """Stacked horizontal bar: exit reason breakdown per condition."""
     conds = data["conditions"]
     if not conds:
@@ -140,7 +214,7 @@ def rq1rq2_exit_reasons(data: dict, out: Path):
     active_reasons = [r for r in EXIT_REASON_ORDER
                       if any(conds[k].get("exit_reasons", {}).get(r, 0) > 0 for k in sorted_keys)]
 
-    fig, ax = plt.subplots(figsize=(14, max(4, len(labels) * 0.85)))
+    fig, ax = subplots(fig, figsize=(14, max(4, len(labels) * 0.85)))
 
     lefts = np.zeros(len(sorted_keys))
     for reason in active_reasons:
@@ -170,15 +244,13 @@ def rq1rq2_exit_reasons(data: dict, out: Path):
     ax.legend(loc="lower right", fontsize=15, ncol=2, framealpha=0.9)
 
     fig.tight_layout()
-    fig.savefig(out / "rq1rq2_exit_reasons.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq1rq2_exit_reasons.png'}")
+    save_figure(fig, out / "rq1rq2_exit_reasons.png")
 
 
 # =====================================================================
 # RQ1+RQ2 CHART 2: Grouped bar — by category for available conditions
 # =====================================================================
-def rq1rq2_category_comparison(data: dict, out: Path):
+def rq1rq2_category_comparison(data: dict, out: Path, fig: Figure = None):
     """Grouped bar chart: all available conditions by category."""
     conds = data["conditions"]
     if not conds:
@@ -192,7 +264,7 @@ def rq1rq2_category_comparison(data: dict, out: Path):
     n = len(keys)
     w = 0.8 / n
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = subplots(fig, figsize=(12, 6))
     for i, key in enumerate(keys):
         rates = [conds[key]["by_category"].get(c, {}).get("solve_rate", 0) * 100 for c in cats]
         color = CONDITION_COLORS.get(key, "#888")
@@ -204,7 +276,7 @@ def rq1rq2_category_comparison(data: dict, out: Path):
     ax.set_title("Solve Rates by Category and Condition",
                  fontsize=14, fontweight="bold", pad=12)
     ax.set_xticks(x)
-    ax.set_xticklabels([c.capitalize() for c in cats], fontsize=11)
+    ax.set_xticklabels(CATEGORY_LABELS, fontsize=11)
     all_rates = [r for key in keys for r in
                  [conds[key]["by_category"].get(c, {}).get("solve_rate", 0) * 100 for c in cats]]
     ax.set_ylim(0, max(all_rates) * 1.3 if all_rates else 45)
@@ -215,15 +287,13 @@ def rq1rq2_category_comparison(data: dict, out: Path):
     ax.spines["right"].set_visible(False)
 
     fig.tight_layout()
-    fig.savefig(out / "rq1rq2_category_comparison.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq1rq2_category_comparison.png'}")
+    save_figure(fig, out / "rq1rq2_category_comparison.png")
 
 
 # =====================================================================
 # RQ1+RQ2 CHART 3: Heatmap table (from heatmap_table.py) + Overall col
 # =====================================================================
-def rq1rq2_heatmap_table(data: dict, out: Path):
+def rq1rq2_heatmap_table(data: dict, out: Path, fig: Figure = None):
     """Heatmap with table-style y-axis showing OS / Tips / AutoPrompt columns,
     plus an Overall accuracy column."""
     conds = data["conditions"]
@@ -237,27 +307,27 @@ def rq1rq2_heatmap_table(data: dict, out: Path):
     env_order = {"ubuntu": 0, "kali": 1}
     prompt_order = {"generic": 0, "tips": 1}
 
-    key_order = sorted(conds.keys(), key=lambda k: (
-        env_order.get(conds[k]["environment"], 2),
-        prompt_order.get(conds[k]["prompts"], 2),
-        0 if not conds[k]["autoprompt"] else 1,
+    rows = sorted(conds.values(), key=lambda c: (
+        env_order.get(c["environment"], 2),
+        prompt_order.get(c["prompts"], 2),
+        0 if not c["autoprompt"] else 1,
     ))
 
-    n_rows = len(key_order)
+    n_rows = len(rows)
     n_cats = len(cats)
 
-    # Build matrix (categories + overall)
-    matrix = np.array([
-        [conds[k]["by_category"][c]["solve_rate"] * 100 for c in cats]
-        for k in key_order
-    ])
+    # Build matrix (categories + overall), scaled to percent in one pass
+    matrix = np.empty((n_rows, n_cats))
+    for ri, c in enumerate(rows):
+        by_category = c["by_category"]
+        matrix[ri] = [by_category[cat]["solve_rate"] for cat in cats]
+    matrix *= 100
 
-    overall_rates = [conds[k]["overall"]["solve_rate"] * 100 for k in key_order]
+    overall_rates = np.fromiter((c["overall"]["solve_rate"] for c in rows), dtype=np.float64, count=n_rows) * 100
 
     # Build table rows
     table_rows = []
-    for k in key_order:
-        c = conds[k]
+    for c in rows:
         table_rows.append({
             "os":   "Kali" if c["environment"] == "kali" else "Ubuntu",
             "tips": "✓" if c["prompts"] == "tips" else "✗",
@@ -267,7 +337,6 @@ def rq1rq2_heatmap_table(data: dict, out: Path):
     # ── Layout: 3 table cols + n_cats heatmap cols + 1 overall col ──
     table_cols = 3
     heat_cols = n_cats + 1  # categories + overall
-    total_cols = table_cols + heat_cols
 
     table_col_w = 1.0
     heat_col_w  = 1.8
@@ -275,113 +344,73 @@ def rq1rq2_heatmap_table(data: dict, out: Path):
     fig_w = total_w * 0.85 + 0.5
     fig_h = n_rows * 0.7 + 1.8
 
-    fig, ax = plt.subplots(figsize=(fig_w, fig_h))
+    fig, ax = subplots(fig, figsize=(fig_w, fig_h))
     ax.set_xlim(0, total_w)
     ax.set_ylim(-0.5, n_rows + 0.5)
     ax.axis("off")
     ax.invert_yaxis()
 
     cmap = plt.cm.Blues
-    vmax = max(matrix.max(), max(overall_rates))
+    vmax = max(matrix.max(), overall_rates.max())
     norm = PowerNorm(gamma=2.0, vmin=0, vmax=vmax)
 
-    def col_x(col_idx):
-        """Return (left, center, right) of a logical column."""
-        x = 0
-        for i in range(col_idx):
-            x += table_col_w if i < table_cols else heat_col_w
-        w = table_col_w if col_idx < table_cols else heat_col_w
-        return x, x + w / 2, x + w
+    # Cell edges: header row from -0.5 to 0.5, then one unit per data row
+    x_edges = np.concatenate(([0], np.cumsum([table_col_w] * table_cols + [heat_col_w] * heat_cols)))
+    centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_edges = np.arange(n_rows + 1) + 0.5
 
     # ── Header row ──
-    header_labels = ["OS", "Tips", "AP"] + [c.capitalize() for c in cats] + ["Overall"]
-    for ci in range(total_cols):
-        left, cx, right = col_x(ci)
-        w = table_col_w if ci < table_cols else heat_col_w
-
-        if ci < table_cols:
-            fc, tc = "#1a3a5c", "white"
-        elif ci == total_cols - 1:
-            fc, tc = "#1a5c3a", "white"  # green tint for Overall
-        else:
-            fc, tc = "#2c5f8a", "white"
-
-        rect = plt.Rectangle((left, -0.5), w, 1, facecolor=fc, edgecolor="white",
-                              linewidth=1.5, clip_on=False)
-        ax.add_patch(rect)
-        ax.text(cx, 0, header_labels[ci], ha="center", va="center",
-                fontsize=15, fontweight="bold", color=tc)
+    header_colors = ["#1a3a5c"] * table_cols + ["#2c5f8a"] * n_cats + ["#1a5c3a"]  # green tint for Overall
+    fill_cells(ax, x_edges, [-0.5, 0.5], [header_colors], edgecolors="white", linewidth=1.5, clip_on=False)
+    for cx, label in zip(centers, RQ12_HEADER):
+        ax.text(cx, 0, label, ha="center", va="center",
+                fontsize=15, fontweight="bold", color="white")
 
     # Find split point between Ubuntu and Kali rows
-    kali_start = None
-    for ri, k in enumerate(key_order):
-        if conds[k]["environment"] == "kali":
-            kali_start = ri
-            break
-
-    # ── Data rows ──
-    for ri in range(n_rows):
-        y_top = ri + 0.5
-        is_kali = conds[key_order[ri]]["environment"] == "kali"
-
-        # Table columns
-        row = table_rows[ri]
-        vals = [row["os"], row["tips"], row["ap"]]
-        for ci in range(table_cols):
-            left, cx, right = col_x(ci)
-
-            if ri % 2 == 0:
-                bg = "#e0ecf8" if not is_kali else "#ddf0e5"
-            else:
-                bg = "#f0f5fc" if not is_kali else "#edf8f1"
-
-            rect = plt.Rectangle((left, y_top), table_col_w, 1,
-                                 facecolor=bg, edgecolor="#ccc", linewidth=0.8, clip_on=False)
-            ax.add_patch(rect)
-
-            txt = vals[ci]
-            if txt == "✓":
-                tc_color, fw = "#1e8449", "bold"
-            elif txt == "✗":
-                tc_color, fw = "#c0392b", "bold"
-            else:
-                tc_color, fw = "#1a1a2e", "normal"
-
-            ax.text(cx, ri + 1, txt, ha="center", va="center",
-                    fontsize=14, fontweight=fw, color=tc_color)
-
-        # Heatmap columns (categories)
-        for cj in range(n_cats):
-            ci = table_cols + cj
-            left, cx, right = col_x(ci)
-            val = matrix[ri, cj]
-            fc = cmap(norm(val))
-
-            rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                                 facecolor=fc, edgecolor="white", linewidth=1.5, clip_on=False)
-            ax.add_patch(rect)
-
-            text_color = "white" if val > 40 else "#1a1a2e"
-            ax.text(cx, ri + 1, f"{val:.1f}%", ha="center", va="center",
-                    fontsize=15, fontweight="bold", color=text_color)
-
-        # Overall column
-        ci_overall = table_cols + n_cats
-        left, cx, right = col_x(ci_overall)
-        ov = overall_rates[ri]
-        fc = cmap(norm(ov))
-
-        rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                              facecolor=fc, edgecolor="white", linewidth=2, clip_on=False)
-        ax.add_patch(rect)
-
-        total = data.get("total_challenges", 200)
-        solved = conds[key_order[ri]]["overall"]["solved"]
-        text_color = "white" if ov > 40 else "#1a1a2e"
-        ax.text(cx, ri + 0.85, f"{ov:.1f}%", ha="center", va="center",
-                fontsize=13, fontweight="bold", color=text_color)
-        ax.text(cx, ri + 1.2, f"{solved}/{total}", ha="center", va="center",
-                fontsize=14, color=text_color, alpha=0.75)
+    is_kali = [c["environment"] == "kali" for c in rows]
+    kali_start = is_kali.index(True) if True in is_kali else None
+
+    # ── Table columns ──
+    backgrounds = []
+    for ri, kali in enumerate(is_kali):
+        if ri % 2 == 0:
+            bg = "#e0ecf8" if not kali else "#ddf0e5"
+        else:
+            bg = "#f0f5fc" if not kali else "#edf8f1"
+        backgrounds.append([bg] * table_cols)
+    fill_cells(ax, x_edges[:table_cols + 1], y_edges, backgrounds, edgecolors="#ccc", linewidth=0.8, clip_on=False)
+
+    mark_styles = {"✓": ("#1e8449", "bold"), "✗": ("#c0392b", "bold")}
+    table_labels = [(centers[ci], ri + 1, txt)
+                    for ri, row in enumerate(table_rows)
+                    for ci, txt in enumerate((row["os"], row["tips"], row["ap"]))]
+    for cx, cy, txt in table_labels:
+        tc_color, fw = mark_styles.get(txt, ("#1a1a2e", "normal"))
+        ax.text(cx, cy, txt, ha="center", va="center",
+                fontsize=14, fontweight=fw, color=tc_color)
+
+    # ── Heatmap columns (categories) ──
+    ax.pcolormesh(x_edges[table_cols:-1], y_edges, matrix, cmap=cmap, norm=norm,
+                  edgecolors="white", linewidth=1.5, antialiased=True, clip_on=False,
+                  rasterized=True)
+    text_colors = np.where(matrix > 40, "white", "#1a1a2e")
+    heat_labels = [(centers[table_cols + cj], ri + 1, f"{val:.1f}%", text_colors[ri, cj])
+                   for (ri, cj), val in np.ndenumerate(matrix)]
+    label_cells(ax, heat_labels, fontsize=15, fontweight="bold")
+
+    # ── Overall column ──
+    ax.pcolormesh(x_edges[-2:], y_edges, overall_rates[:, None], cmap=cmap, norm=norm,
+                  edgecolors="white", linewidth=2, antialiased=True, clip_on=False,
+                  rasterized=True)
+    total = data.get("total_challenges", 200)
+    cx = centers[-1]
+    overall_colors = np.where(overall_rates > 40, "white", "#1a1a2e")
+    label_cells(ax, [(cx, ri + 0.85, f"{ov:.1f}%", text_color)
+                     for ri, (ov, text_color) in enumerate(zip(overall_rates, overall_colors))],
+                fontsize=13, fontweight="bold")
+    label_cells(ax, [(cx, ri + 1.2, f"{c['overall']['solved']}/{total}", text_color)
+                     for ri, (c, text_color) in enumerate(zip(rows, overall_colors))],
+                fontsize=14, alpha=0.75)
 
     # ── Divider between Ubuntu and Kali groups ──
     if kali_start is not None and kali_start > 0:
@@ -391,15 +420,25 @@ def rq1rq2_heatmap_table(data: dict, out: Path):
     fig.suptitle("Solve Rates by Experiment Configuration and Challenge Category",
                  fontsize=15, fontweight="bold", x=0.5, y=0.97, ha="center")
 
-    fig.savefig(out / "rq1rq2_heatmap_table.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq1rq2_heatmap_table.png'}")
+    save_figure(fig, out / "rq1rq2_heatmap_table.png")
+
+
+def provider_legend(data: dict) -> list:
+    """Legend patches of the providers among the RQ3 models, in PROVIDER_COLORS order."""
+    return provider_patches(frozenset(m["provider"] for m in data["models"]))
+
+
+@functools.cache
+def provider_patches(providers: frozenset) -> list:
+    """Patches depend only on PROVIDER_COLORS, so they are built once per provider set.
+    ax.legend() copies their properties, so charts can share them."""
+    return [Patch(facecolor=c, label=p) for p, c in PROVIDER_COLORS.items() if p in providers]
 
 
 # =====================================================================
 # RQ3 CHART 0: Stacked bar — exit reason breakdown per model
 # =====================================================================
-def rq3_exit_reasons(data: dict, out: Path):
+def rq3_exit_reasons(data: dict, out: Path, fig: Figure = None):
     """Stacked horizontal bar: exit reason breakdown per RQ3 model."""
     models = sorted(data["models"], key=lambda m: m["overall"]["solve_rate"])
     if not models:
@@ -416,7 +455,7 @@ def rq3_exit_reasons(data: dict, out: Path):
     active_reasons = [r for r in EXIT_REASON_ORDER
                       if any(m.get("exit_reasons", {}).get(r, 0) > 0 for m in models)]
 
-    fig, ax = plt.subplots(figsize=(14, max(4, len(labels) * 0.85)))
+    fig, ax = subplots(fig, figsize=(14, max(4, len(labels) * 0.85)))
 
     lefts = np.zeros(len(models))
     for reason in active_reasons:
@@ -446,15 +485,13 @@ def rq3_exit_reasons(data: dict, out: Path):
     ax.legend(loc="lower right", fontsize=15, ncol=2, framealpha=0.9)
 
     fig.tight_layout()
-    fig.savefig(out / "rq3_exit_reasons.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq3_exit_reasons.png'}")
+    save_figure(fig, out / "rq3_exit_reasons.png")
 
 
 # =====================================================================
 # RQ3 CHART 1: Horizontal bar chart — models ranked by solve rate
 # =====================================================================
-def rq3_horizontal_bar(data: dict, out: Path):
+def rq3_horizontal_bar(data: dict, out: Path, fig: Figure = None):
     """RQ3 – Horizontal bar chart: models ranked by overall solve rate."""
     models = sorted(data["models"], key=lambda m: m["overall"]["solve_rate"])
     if not models:
@@ -465,7 +502,7 @@ def rq3_horizontal_bar(data: dict, out: Path):
     rates = [m["overall"]["solve_rate"] * 100 for m in models]
     colors = [PROVIDER_COLORS.get(m["provider"], "#888") for m in models]
 
-    fig, ax = plt.subplots(figsize=(12, max(5, len(models) * 0.75)))
+    fig, ax = subplots(fig, figsize=(12, max(5, len(models) * 0.75)))
     bars = ax.barh(names, rates, color=colors, edgecolor="white", linewidth=0.8, height=0.7, zorder=3)
     ax.set_xlabel("Solve Rate (%)", fontsize=14, fontweight="bold")
     ax.set_title("Model Benchmark — Overall Solve Rates on NYU CTF Bench",
@@ -481,43 +518,42 @@ def rq3_horizontal_bar(data: dict, out: Path):
         label.set_va("center")
 
     total = data.get("total_challenges", 200)
-    for bar, rate, m in zip(bars, rates, models):
-        solved = m["overall"]["solved"]
-        ax.text(bar.get_width() + 0.5, bar.get_y() + bar.get_height()/2,
-                f"{rate:.1f}%  ({solved}/{total})", va="center", fontsize=14,
-                fontweight="bold", color="#333")
+    ax.bar_label(bars, labels=[f"{rate:.1f}%  ({m['overall']['solved']}/{total})"
+                               for rate, m in zip(rates, models)],
+                 padding=4, fontsize=14, fontweight="bold", color="#333")
 
-    from matplotlib.patches import Patch
-    legend_elements = [Patch(facecolor=c, label=p) for p, c in PROVIDER_COLORS.items()
-                       if p in {m["provider"] for m in models}]
+    legend_elements = provider_legend(data)
     if legend_elements:
         ax.legend(handles=legend_elements, loc="lower right", fontsize=14,
                   title="Provider", title_fontsize=12)
     fig.tight_layout()
-    fig.savefig(out / "rq3_model_ranking.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq3_model_ranking.png'}")
+    save_figure(fig, out / "rq3_model_ranking.png")
 
 
 # =====================================================================
 # RQ3 CHART 2: Cost vs solve rate scatter
 # =====================================================================
-def rq3_cost_vs_solve(data: dict, out: Path):
+def rq3_cost_vs_solve(data: dict, out: Path, fig: Figure = None):
     """RQ3 – Scatter plot: cost per challenge vs solve rate."""
     models = data["models"]
     if not models:
         print("  ⚠ No models available, skipping cost_vs_solve")
         return
 
-    fig, ax = plt.subplots(figsize=(12, 8))
-    for m in models:
-        x = m["overall"].get("avg_cost", 0)
-        y = m["overall"]["solve_rate"] * 100
-        s = m["overall"].get("total_cost", 10) * 8 + 120
-        c = PROVIDER_COLORS.get(m["provider"], "#888")
-        ax.scatter(x, y, s=s, c=c, alpha=0.75, edgecolors="white", linewidth=1.5, zorder=3)
-        ax.annotate(m["name"], (x, y), fontsize=13, fontweight="bold", ha="left", va="bottom",
-                    xytext=(6, 5), textcoords="offset points", color="#333")
+    xs = np.fromiter((m["overall"].get("avg_cost", 0) for m in models), dtype=np.float64, count=len(models))
+    ys = np.fromiter((m["overall"]["solve_rate"] for m in models), dtype=np.float64, count=len(models)) * 100
+    sizes = [m["overall"].get("total_cost", 10) * 8 + 120 for m in models]
+    colors = [PROVIDER_COLORS.get(m["provider"], "#888") for m in models]
+
+    fig, ax = subplots(fig, figsize=(12, 8))
+    # One collection for all models; rasterized in vector output, the labels above stay text
+    ax.scatter(xs, ys, s=sizes, c=colors, alpha=0.75, edgecolors="white", linewidth=1.5, zorder=3,
+               rasterized=True)
+    # Labels sit 6pt right and 5pt above their point; one shared transform instead of an Annotation each
+    label_offset = ax.transData + ScaledTranslation(6 / 72, 5 / 72, fig.dpi_scale_trans)
+    for m, x, y in zip(models, xs, ys):
+        ax.text(x, y, m["name"], transform=label_offset, fontsize=13, fontweight="bold",
+                ha="left", va="bottom", color="#333", zorder=4)
     ax.set_xlabel("Avg Cost per Challenge ($)", fontsize=16, fontweight="bold")
     ax.set_ylabel("Solve Rate (%)", fontsize=16, fontweight="bold")
     ax.set_title("Cost-Performance Tradeoff", fontsize=18, fontweight="bold", pad=14)
@@ -529,22 +565,18 @@ def rq3_cost_vs_solve(data: dict, out: Path):
                 xy=(0.02, 0.98), xycoords="axes fraction", fontsize=14,
                 color="#999", ha="left", va="top", style="italic")
 
-    from matplotlib.patches import Patch
-    legend_elements = [Patch(facecolor=c, label=p) for p, c in PROVIDER_COLORS.items()
-                       if p in {m["provider"] for m in models}]
+    legend_elements = provider_legend(data)
     if legend_elements:
         ax.legend(handles=legend_elements, loc="lower right", fontsize=13,
                   title="Provider", title_fontsize=14)
     fig.tight_layout()
-    fig.savefig(out / "rq3_cost_vs_solve.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq3_cost_vs_solve.png'}")
+    save_figure(fig, out / "rq3_cost_vs_solve.png")
 
 
 # =====================================================================
 # RQ3 CHART 3: Heatmap table — models × categories + overall
 # =====================================================================
-def rq3_heatmap_table(data: dict, out: Path):
+def rq3_heatmap_table(data: dict, out: Path, fig: Figure = None):
     """RQ3 – Table-style heatmap: models × categories with overall column."""
     cats = CATEGORY_ORDER
     models_sorted = sorted(data["models"], key=lambda m: m["overall"]["solve_rate"], reverse=True)
@@ -556,144 +588,117 @@ def rq3_heatmap_table(data: dict, out: Path):
     n_rows = len(names)
     n_cats = len(cats)
 
-    # Build matrix
-    matrix = np.array([[m["by_category"].get(c, 0) * 100 for c in cats] for m in models_sorted])
-    overall_rates = [m["overall"]["solve_rate"] * 100 for m in models_sorted]
+    # Build matrix, scaled to percent in one pass
+    matrix = np.empty((n_rows, n_cats))
+    for ri, m in enumerate(models_sorted):
+        by_category = m["by_category"]
+        matrix[ri] = [by_category.get(c, 0) for c in cats]
+    matrix *= 100
+    overall_rates = np.fromiter((m["overall"]["solve_rate"] for m in models_sorted), dtype=np.float64, count=n_rows) * 100
 
     # Layout: 1 model-name col + n_cats heat cols + 1 overall col
     name_col_w = 3.0
     heat_col_w = 1.8
-    total_cols = 1 + n_cats + 1
     total_w = name_col_w + (n_cats + 1) * heat_col_w
     fig_w = total_w * 0.85 + 0.5
     fig_h = n_rows * 0.7 + 1.8
 
-    fig, ax = plt.subplots(figsize=(fig_w, fig_h))
+    fig, ax = subplots(fig, figsize=(fig_w, fig_h))
     ax.set_xlim(0, total_w)
     ax.set_ylim(-0.5, n_rows + 0.5)
     ax.axis("off")
     ax.invert_yaxis()
 
     cmap = plt.cm.YlGnBu
-    vmax = max(matrix.max(), max(overall_rates)) * 1.15
+    vmax = max(matrix.max(), overall_rates.max()) * 1.15
     norm = Normalize(vmin=0, vmax=vmax)
 
-    def col_x(col_idx):
-        if col_idx == 0:
-            return 0, name_col_w / 2, name_col_w
-        x = name_col_w + (col_idx - 1) * heat_col_w
-        return x, x + heat_col_w / 2, x + heat_col_w
+    # Cell edges: header row from -0.5 to 0.5, then one unit per data row
+    x_edges = np.concatenate(([0], name_col_w + heat_col_w * np.arange(n_cats + 2)))
+    centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_edges = np.arange(n_rows + 1) + 0.5
 
     # ── Header row ──
-    header_labels = ["Model"] + [c.capitalize() for c in cats] + ["Overall"]
-    for ci in range(total_cols):
-        left, cx, right = col_x(ci)
-        w = name_col_w if ci == 0 else heat_col_w
-
-        if ci == 0:
-            fc, tc = "#1a3a5c", "white"
-        elif ci == total_cols - 1:
-            fc, tc = "#1a5c3a", "white"
-        else:
-            fc, tc = "#2c5f8a", "white"
-
-        rect = plt.Rectangle((left, -0.5), w, 1, facecolor=fc, edgecolor="white",
-                              linewidth=1.5, clip_on=False)
-        ax.add_patch(rect)
-        ax.text(cx, 0, header_labels[ci], ha="center", va="center",
-                fontsize=14, fontweight="bold", color=tc)
-
-    # ── Data rows ──
-    for ri in range(n_rows):
-        y_top = ri + 0.5
-
-        # Model name column
-        left, cx, right = col_x(0)
-        bg = "#e0ecf8" if ri % 2 == 0 else "#f0f5fc"
-        rect = plt.Rectangle((left, y_top), name_col_w, 1,
-                              facecolor=bg, edgecolor="#ccc", linewidth=0.8, clip_on=False)
-        ax.add_patch(rect)
-        provider_color = PROVIDER_COLORS.get(models_sorted[ri]["provider"], "#1a1a2e")
-        ax.text(cx, ri + 1, names[ri], ha="center", va="center",
+    header_colors = ["#1a3a5c"] + ["#2c5f8a"] * n_cats + ["#1a5c3a"]
+    fill_cells(ax, x_edges, [-0.5, 0.5], [header_colors], edgecolors="white", linewidth=1.5, clip_on=False)
+    for cx, label in zip(centers, RQ3_HEADER):
+        ax.text(cx, 0, label, ha="center", va="center",
+                fontsize=14, fontweight="bold", color="white")
+
+    # ── Model name column ──
+    backgrounds = [["#e0ecf8" if ri % 2 == 0 else "#f0f5fc"] for ri in range(n_rows)]
+    fill_cells(ax, x_edges[:2], y_edges, backgrounds, edgecolors="#ccc", linewidth=0.8, clip_on=False)
+    for ri, m in enumerate(models_sorted):
+        provider_color = PROVIDER_COLORS.get(m["provider"], "#1a1a2e")
+        ax.text(centers[0], ri + 1, names[ri], ha="center", va="center",
                 fontsize=13, fontweight="bold", color=provider_color)
 
-        # Category columns
-        for cj in range(n_cats):
-            ci = 1 + cj
-            left, cx, right = col_x(ci)
-            val = matrix[ri, cj]
-            fc = cmap(norm(val))
-
-            rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                                 facecolor=fc, edgecolor="white", linewidth=1.5, clip_on=False)
-            ax.add_patch(rect)
-
-            text_color = "white" if val > 30 else "black"
-            ax.text(cx, ri + 1, f"{val:.1f}%", ha="center", va="center",
-                    fontsize=13, fontweight="bold", color=text_color)
-
-        # Overall column
-        ci_overall = 1 + n_cats
-        left, cx, right = col_x(ci_overall)
-        ov = overall_rates[ri]
-        fc = cmap(norm(ov))
-
-        rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                              facecolor=fc, edgecolor="white", linewidth=2, clip_on=False)
-        ax.add_patch(rect)
-
-        total = data.get("total_challenges", 200)
-        solved = models_sorted[ri]["overall"]["solved"]
-        text_color = "white" if ov > 30 else "black"
-        ax.text(cx, ri + 0.85, f"{ov:.1f}%", ha="center", va="center",
-                fontsize=15, fontweight="bold", color=text_color)
-        ax.text(cx, ri + 1.2, f"{solved}/{total}", ha="center", va="center",
-                fontsize=14, color=text_color, alpha=0.75)
+    # ── Category columns ──
+    ax.pcolormesh(x_edges[1:-1], y_edges, matrix, cmap=cmap, norm=norm,
+                  edgecolors="white", linewidth=1.5, antialiased=True, clip_on=False,
+                  rasterized=True)
+    text_colors = np.where(matrix > 30, "white", "black")
+    heat_labels = [(centers[1 + cj], ri + 1, f"{val:.1f}%", text_colors[ri, cj])
+                   for (ri, cj), val in np.ndenumerate(matrix)]
+    label_cells(ax, heat_labels, fontsize=13, fontweight="bold")
+
+    # ── Overall column ──
+    ax.pcolormesh(x_edges[-2:], y_edges, overall_rates[:, None], cmap=cmap, norm=norm,
+                  edgecolors="white", linewidth=2, antialiased=True, clip_on=False,
+                  rasterized=True)
+    total = data.get("total_challenges", 200)
+    cx = centers[-1]
+    overall_colors = np.where(overall_rates > 30, "white", "black")
+    label_cells(ax, [(cx, ri + 0.85, f"{ov:.1f}%", text_color)
+                     for ri, (ov, text_color) in enumerate(zip(overall_rates, overall_colors))],
+                fontsize=15, fontweight="bold")
+    label_cells(ax, [(cx, ri + 1.2, f"{m['overall']['solved']}/{total}", text_color)
+                     for ri, (m, text_color) in enumerate(zip(models_sorted, overall_colors))],
+                fontsize=14, alpha=0.75)
 
     fig.suptitle("RQ3: Solve Rates by Model × Category",
                  fontsize=15, fontweight="bold", x=0.5, y=0.97, ha="center")
 
-    fig.savefig(out / "rq3_heatmap_table.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq3_heatmap_table.png'}")
+    save_figure(fig, out / "rq3_heatmap_table.png")
 
 
 # =====================================================================
 # RQ3 CHART 4: Model type comparison
 # =====================================================================
-def rq3_model_type_comparison(data: dict, out: Path):
+def rq3_model_type_comparison(data: dict, out: Path, fig: Figure = None):
     """RQ3 – Bar: average solve rate by model type."""
     models = data["models"]
     if not models:
         print("  ⚠ No models available, skipping model_type_comparison")
         return
 
-    type_rates: dict[str, list[float]] = {}
-    for m in models:
-        type_rates.setdefault(m["type"], []).append(m["overall"]["solve_rate"] * 100)
-    types = sorted(type_rates.keys(), key=lambda t: np.mean(type_rates[t]), reverse=True)
-    means = [np.mean(type_rates[t]) for t in types]
-    stds  = [np.std(type_rates[t]) for t in types]
+    # Per-type count, mean and (population) std from grouped sums over the model type codes
+    rates = np.fromiter((m["overall"]["solve_rate"] * 100 for m in models), dtype=np.float64, count=len(models))
+    types, first, inverse = np.unique([m["type"] for m in models], return_index=True, return_inverse=True)
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=rates) / counts
+    stds  = np.sqrt(np.maximum(np.bincount(inverse, weights=rates * rates) / counts - means ** 2, 0))
+    # Highest mean first, ties in order of first appearance
+    order = np.lexsort((first, -means))
+    types, means, stds, counts = types[order], means[order], stds[order], counts[order]
     colors_list = [PALETTE.get(t, "#888") for t in types]
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(fig, figsize=(9, 5))
     bars = ax.bar(range(len(types)), means, yerr=stds, capsize=5,
                   color=colors_list, edgecolor="white", linewidth=1, zorder=3)
     ax.set_ylabel("Avg Solve Rate (%)", fontsize=15, fontweight="bold")
     ax.set_title("Performance by Model Type", fontsize=14, fontweight="bold", pad=12)
     ax.set_xticks(range(len(types)))
     ax.set_xticklabels([t.replace("-", " ").title() for t in types], fontsize=13, rotation=15, ha="right")
-    ax.set_ylim(0, max(means) * 1.4 if means else 45)
+    ax.set_ylim(0, means.max() * 1.4)
     ax.grid(axis="y", alpha=0.3, zorder=0)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
-    for b, m_val, n in zip(bars, means, [len(type_rates[t]) for t in types]):
+    for b, m_val, n in zip(bars, means, counts):
         ax.text(b.get_x() + b.get_width()/2, b.get_height() + 1.5,
                 f"{m_val:.1f}%\n(n={n})", ha="center", fontsize=15, color="#333")
     fig.tight_layout()
-    fig.savefig(out / "rq3_model_types.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq3_model_types.png'}")
+    save_figure(fig, out / "rq3_model_types.png")
 
 
 # =====================================================================
@@ -707,7 +712,7 @@ RQ4_COLORS = {
 }
 
 
-def rq4_architecture_bar(data: dict, out: Path):
+def rq4_architecture_bar(data: dict, out: Path, fig: Figure = None):
     """RQ4 – Bar chart comparing planner/executor combinations."""
     conds = data.get("conditions", {})
     if not conds:
@@ -719,7 +724,7 @@ def rq4_architecture_bar(data: dict, out: Path):
     rates = [conds[k]["overall"]["solve_rate"] * 100 for k in sorted_keys]
     colors = [RQ4_COLORS.get(k, "#888") for k in sorted_keys]
 
-    fig, ax = plt.subplots(figsize=(12, max(3.5, len(labels) * 0.9)))
+    fig, ax = subplots(fig, figsize=(12, max(3.5, len(labels) * 0.9)))
     bars = ax.barh(labels, rates, color=colors, edgecolor="white", linewidth=1, height=0.6, zorder=3)
 
     ax.set_xlabel("Solve Rate (%)", fontsize=15, fontweight="bold")
@@ -740,12 +745,10 @@ def rq4_architecture_bar(data: dict, out: Path):
                 fontweight="bold", color="#333")
 
     fig.tight_layout()
-    fig.savefig(out / "rq4_architecture.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq4_architecture.png'}")
+    save_figure(fig, out / "rq4_architecture.png")
 
 
-def rq4_category_heatmap(data: dict, out: Path):
+def rq4_category_heatmap(data: dict, out: Path, fig: Figure = None):
     """RQ4 – Heatmap: planner/executor combos × categories."""
     conds = data.get("conditions", {})
     cats = CATEGORY_ORDER
@@ -760,95 +763,77 @@ def rq4_category_heatmap(data: dict, out: Path):
         [conds[k]["by_category"][c]["solve_rate"] * 100 for c in cats]
         for k in key_order
     ])
-    overall_rates = [conds[k]["overall"]["solve_rate"] * 100 for k in key_order]
+    overall_rates = np.array([conds[k]["overall"]["solve_rate"] * 100 for k in key_order])
 
     name_col_w = 4.5
     heat_col_w = 1.8
-    total_cols = 1 + n_cats + 1
     total_w = name_col_w + (n_cats + 1) * heat_col_w
     fig_w = total_w * 0.85 + 0.5
     fig_h = n_rows * 0.7 + 1.8
 
-    fig, ax = plt.subplots(figsize=(fig_w, fig_h))
+    fig, ax = subplots(fig, figsize=(fig_w, fig_h))
     ax.set_xlim(0, total_w)
     ax.set_ylim(-0.5, n_rows + 0.5)
     ax.axis("off")
     ax.invert_yaxis()
 
     cmap = plt.cm.YlGnBu
-    vmax = max(matrix.max(), max(overall_rates)) * 1.15 if overall_rates else 50
+    vmax = max(matrix.max(), overall_rates.max()) * 1.15
     norm = Normalize(vmin=0, vmax=vmax)
+    # Cell and label colors for the whole table at once
+    cell_colors = cmap(norm(matrix))
+    overall_cell_colors = cmap(norm(overall_rates))
+    text_colors = np.where(matrix > 30, "white", "black")
+    overall_text_colors = np.where(overall_rates > 30, "white", "black")
+
+    # Column edges and centers: configuration name, categories, overall
+    widths = np.array([name_col_w] + [heat_col_w] * (n_cats + 1))
+    lefts = np.concatenate(([0.0], np.cumsum(widths)))[:-1]
+    centers = lefts + widths / 2
+
+    # Header row and configuration name column, one collection each
+    x_edges = np.append(lefts, lefts[-1] + widths[-1])
+    y_edges = np.arange(n_rows + 1) + 0.5
+    header_colors = ["#1a3a5c"] + ["#2c5f8a"] * n_cats + ["#1a5c3a"]
+    fill_cells(ax, x_edges, [-0.5, 0.5], [header_colors], edgecolors="white", linewidth=1.5, clip_on=False)
+    for cx, label in zip(centers, RQ4_HEADER):
+        ax.text(cx, 0, label, ha="center", va="center",
+                fontsize=14, fontweight="bold", color="white")
+    backgrounds = [["#e0ecf8" if ri % 2 == 0 else "#f0f5fc"] for ri in range(n_rows)]
+    fill_cells(ax, x_edges[:2], y_edges, backgrounds, edgecolors="#ccc", linewidth=0.8, clip_on=False)
+
+    # Heat cells: the category columns and the overall column, one collection each
+    fill_cells(ax, x_edges[1:-1], y_edges, [[to_hex(c) for c in row] for row in cell_colors],
+               edgecolors="white", linewidth=1.5, clip_on=False)
+    fill_cells(ax, x_edges[-2:], y_edges, [[to_hex(c)] for c in overall_cell_colors],
+               edgecolors="white", linewidth=2, clip_on=False)
 
-    def col_x(col_idx):
-        if col_idx == 0:
-            return 0, name_col_w / 2, name_col_w
-        x = name_col_w + (col_idx - 1) * heat_col_w
-        return x, x + heat_col_w / 2, x + heat_col_w
-
-    header_labels = ["Configuration"] + [c.capitalize() for c in cats] + ["Overall"]
-    for ci in range(total_cols):
-        left, cx, right = col_x(ci)
-        w = name_col_w if ci == 0 else heat_col_w
-        if ci == 0:
-            fc, tc = "#1a3a5c", "white"
-        elif ci == total_cols - 1:
-            fc, tc = "#1a5c3a", "white"
-        else:
-            fc, tc = "#2c5f8a", "white"
-        rect = plt.Rectangle((left, -0.5), w, 1, facecolor=fc, edgecolor="white",
-                              linewidth=1.5, clip_on=False)
-        ax.add_patch(rect)
-        ax.text(cx, 0, header_labels[ci], ha="center", va="center",
-                fontsize=14, fontweight="bold", color=tc)
-
+    total = data.get("total_challenges", 200)
     for ri, k in enumerate(key_order):
-        y_top = ri + 0.5
-        left, cx, right = col_x(0)
-        bg = "#e0ecf8" if ri % 2 == 0 else "#f0f5fc"
-        rect = plt.Rectangle((left, y_top), name_col_w, 1,
-                              facecolor=bg, edgecolor="#ccc", linewidth=0.8, clip_on=False)
-        ax.add_patch(rect)
-        ax.text(cx, ri + 1, conds[k]["label"], ha="center", va="center",
+        ax.text(centers[0], ri + 1, conds[k]["label"], ha="center", va="center",
                 fontsize=13, fontweight="bold", color="#1a1a2e")
 
         for cj in range(n_cats):
-            ci = 1 + cj
-            left, cx, right = col_x(ci)
-            val = matrix[ri, cj]
-            fc = cmap(norm(val))
-            rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                                 facecolor=fc, edgecolor="white", linewidth=1.5, clip_on=False)
-            ax.add_patch(rect)
-            text_color = "white" if val > 30 else "black"
-            ax.text(cx, ri + 1, f"{val:.1f}%", ha="center", va="center",
-                    fontsize=13, fontweight="bold", color=text_color)
-
-        ci_overall = 1 + n_cats
-        left, cx, right = col_x(ci_overall)
-        ov = overall_rates[ri]
-        fc = cmap(norm(ov))
-        rect = plt.Rectangle((left, y_top), heat_col_w, 1,
-                              facecolor=fc, edgecolor="white", linewidth=2, clip_on=False)
-        ax.add_patch(rect)
-        total = data.get("total_challenges", 200)
+            ax.text(centers[1 + cj], ri + 1, f"{matrix[ri, cj]:.1f}%", ha="center", va="center",
+                    fontsize=13, fontweight="bold", color=text_colors[ri, cj])
+
+        cx = centers[-1]
         solved = conds[k]["overall"]["solved"]
-        text_color = "white" if ov > 30 else "black"
-        ax.text(cx, ri + 0.85, f"{ov:.1f}%", ha="center", va="center",
+        text_color = overall_text_colors[ri]
+        ax.text(cx, ri + 0.85, f"{overall_rates[ri]:.1f}%", ha="center", va="center",
                 fontsize=15, fontweight="bold", color=text_color)
         ax.text(cx, ri + 1.2, f"{solved}/{total}", ha="center", va="center",
                 fontsize=14, color=text_color, alpha=0.75)
 
     fig.suptitle("RQ4: Planner/Executor Architecture × Category",
                  fontsize=15, fontweight="bold", x=0.5, y=0.97, ha="center")
-    fig.savefig(out / "rq4_heatmap_table.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq4_heatmap_table.png'}")
+    save_figure(fig, out / "rq4_heatmap_table.png")
 
 
 # =====================================================================
 # RQ5 CHART: Reproducibility — solve rate across runs
 # =====================================================================
-def rq5_reproducibility_chart(data: dict, out: Path):
+def rq5_reproducibility_chart(data: dict, out: Path, fig: Figure = None):
     """RQ5 – Line/bar chart showing solve rate variance across runs."""
     runs = data.get("runs", [])
     if len(runs) < 2:
@@ -860,7 +845,7 @@ def rq5_reproducibility_chart(data: dict, out: Path):
     mean_rate = np.mean(rates)
     std_rate = np.std(rates)
 
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig, ax = subplots(fig, figsize=(10, 5))
     x = range(len(runs))
     bars = ax.bar(x, rates, color="#4285F4", edgecolor="white", linewidth=1, zorder=3)
     ax.axhline(y=mean_rate, color="#E74C3C", linewidth=2, linestyle="--", zorder=4,
@@ -888,19 +873,17 @@ def rq5_reproducibility_chart(data: dict, out: Path):
                 fontsize=15, fontweight="bold", color="#333")
 
     fig.tight_layout()
-    fig.savefig(out / "rq5_reproducibility.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq5_reproducibility.png'}")
+    save_figure(fig, out / "rq5_reproducibility.png")
 
 
-def rq5_category_variance(data: dict, out: Path):
+def rq5_category_variance(data: dict, out: Path, fig: Figure = None):
     """RQ5 – Grouped bar: per-category solve rates across runs."""
     runs = data.get("runs", [])
     cats = CATEGORY_ORDER
     if len(runs) < 2:
         return
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = subplots(fig, figsize=(12, 6))
     x = np.arange(len(cats))
     n = len(runs)
     w = 0.8 / n
@@ -916,84 +899,164 @@ def rq5_category_variance(data: dict, out: Path):
     ax.set_title("Per-Category Solve Rates Across Runs",
                  fontsize=14, fontweight="bold", pad=12)
     ax.set_xticks(x)
-    ax.set_xticklabels([c.capitalize() for c in cats], fontsize=11)
+    ax.set_xticklabels(CATEGORY_LABELS, fontsize=11)
     ax.legend(fontsize=12)
     ax.grid(axis="y", alpha=0.3, zorder=0)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
     fig.tight_layout()
-    fig.savefig(out / "rq5_category_variance.png", dpi=200, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓ {out / 'rq5_category_variance.png'}")
+    save_figure(fig, out / "rq5_category_variance.png")
 
 
 # =====================================================================
 # MAIN
 # =====================================================================
+_worker_figure = None
+
+
+def render_plot(plot_fn, data: dict, out: Path):
+    """Run plot_fn in a worker process, recycling one Figure per process."""
+    global _worker_figure
+    if _worker_figure is None:
+        _worker_figure = Figure()
+    plot_fn(data, out, _worker_figure)
+
+
+class PlotCache:
+    """Skips plots whose PNG was already rendered from the same input JSON and script,
+    keyed by PNG name in a .render_cache.json next to the plots. The remaining plots
+    are queued by plot() and rendered together by run()."""
+
+    def __init__(self, out: Path, fig: Figure, force: bool = False):
+        self.out = out
+        self.fig = fig
+        self.path = out / ".render_cache.json"
+        self.script = Path(__file__).read_bytes()
+        self.digests = {}
+        self.pending = []  # (plot_fn, data, digest, png, PNG mtime before rendering)
+        if not force and self.path.exists():
+            try:
+                self.digests = load_json(self.path)
+            except (json.JSONDecodeError, OSError):
+                pass
+
+    def digest(self, input_path: Path) -> str:
+        """Digest of an input JSON together with this script, which decides how it is drawn."""
+        return hashlib.blake2b(self.script + input_path.read_bytes(), digest_size=16).hexdigest()
+
+    def plot(self, plot_fn, data: dict, digest: str, png: str):
+        path = self.out / png
+        before = path.stat().st_mtime_ns if path.exists() else None
+        if before is not None and self.digests.get(png) == digest:
+            print(f"  = {path} (unchanged)")
+            return
+        self.pending.append((plot_fn, data, digest, png, before))
+
+    def run(self, jobs: int = 1):
+        """Render the queued plots, in `jobs` worker processes when there are several.
+        The figures are independent, so they are drawn in parallel."""
+        pending, self.pending = self.pending, []
+        jobs = min(jobs, len(pending))
+        if jobs > 1:
+            # Spawned workers start from a clean matplotlib state instead of a forked copy of this one
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(render_plot, plot_fn, data, self.out) for plot_fn, data, *_ in pending]
+                for future in futures:
+                    future.result()
+        else:
+            for plot_fn, data, *_ in pending:
+                plot_fn(data, self.out, self.fig)
+
+        for _, _, digest, png, before in pending:
+            path = self.out / png
+            # Plots skipped for lack of data leave no (new) PNG behind, they are retried next time
+            if path.exists() and path.stat().st_mtime_ns != before:
+                self.digests[png] = digest
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.digests, f, indent=2, sort_keys=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Visualize D-CIPHER experiment results")
     parser.add_argument("--results-dir", default="tatar-project-results",
                         help="Directory containing JSON result files")
     parser.add_argument("--output-dir", default="tatar-project-paper/figures",
                         help="Directory to save plots")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every plot, even those whose inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of processes rendering plots in parallel (default: 1, render serially)")
     args = parser.parse_args()
 
     results = Path(args.results_dir)
     out = Path(args.output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
+    # One Figure, cleared and resized for each plot instead of building a new one every time.
+    # It is not registered with pyplot, so nothing has to close it
+    fig = Figure()
+    cache = PlotCache(out, fig, force=args.force)
+
     print("Loading experiment data...")
+    rq12_path = results / "rq1_rq2_combined.json"
+    rq3_path = results / "rq3_models.json"
+    rq4_path = results / "rq4_architecture.json"
+    rq5_path = results / "rq5_reproducibility.json"
+    # The result files are independent, read them concurrently
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        rq12, rq3, rq4, rq5 = pool.map(load_json_if_exists, (rq12_path, rq3_path, rq4_path, rq5_path))
 
     # RQ1+RQ2
-    rq12_path = results / "rq1_rq2_combined.json"
-    if rq12_path.exists():
-        rq12 = load_json(rq12_path)
+    if rq12 is not None:
         n_conds = len(rq12.get("conditions", {}))
         print(f"\nRQ1+RQ2: {n_conds} conditions available")
-        rq1rq2_all_conditions_bar(rq12, out)
-        rq1rq2_exit_reasons(rq12, out)
-        rq1rq2_category_comparison(rq12, out)
-        rq1rq2_heatmap_table(rq12, out)
+        digest = cache.digest(rq12_path)
+        cache.plot(rq1rq2_all_conditions_bar, rq12, digest, "rq1rq2_all_conditions.png")
+        cache.plot(rq1rq2_exit_reasons, rq12, digest, "rq1rq2_exit_reasons.png")
+        cache.plot(rq1rq2_category_comparison, rq12, digest, "rq1rq2_category_comparison.png")
+        cache.plot(rq1rq2_heatmap_table, rq12, digest, "rq1rq2_heatmap_table.png")
     else:
         print("\n⚠ rq1_rq2_combined.json not found, skipping RQ1+RQ2 plots")
 
     # RQ3
-    rq3_path = results / "rq3_models.json"
-    if rq3_path.exists():
-        rq3 = load_json(rq3_path)
+    if rq3 is not None:
         n_models = len(rq3.get("models", []))
         print(f"\nRQ3: {n_models} models available")
-        rq3_exit_reasons(rq3, out)
-        rq3_horizontal_bar(rq3, out)
-        rq3_cost_vs_solve(rq3, out)
-        rq3_heatmap_table(rq3, out)
-        rq3_model_type_comparison(rq3, out)
+        digest = cache.digest(rq3_path)
+        cache.plot(rq3_exit_reasons, rq3, digest, "rq3_exit_reasons.png")
+        cache.plot(rq3_horizontal_bar, rq3, digest, "rq3_model_ranking.png")
+        cache.plot(rq3_cost_vs_solve, rq3, digest, "rq3_cost_vs_solve.png")
+        cache.plot(rq3_heatmap_table, rq3, digest, "rq3_heatmap_table.png")
+        cache.plot(rq3_model_type_comparison, rq3, digest, "rq3_model_types.png")
     else:
         print("\n⚠ rq3_models.json not found, skipping RQ3 plots")
 
     # RQ4
-    rq4_path = results / "rq4_architecture.json"
-    if rq4_path.exists():
-        rq4 = load_json(rq4_path)
+    if rq4 is not None:
         n_conds = len(rq4.get("conditions", {}))
         print(f"\nRQ4: {n_conds} conditions available")
-        rq4_architecture_bar(rq4, out)
-        rq4_category_heatmap(rq4, out)
+        digest = cache.digest(rq4_path)
+        cache.plot(rq4_architecture_bar, rq4, digest, "rq4_architecture.png")
+        cache.plot(rq4_category_heatmap, rq4, digest, "rq4_heatmap_table.png")
     else:
         print("\n⚠ rq4_architecture.json not found, skipping RQ4 plots")
 
     # RQ5
-    rq5_path = results / "rq5_reproducibility.json"
-    if rq5_path.exists():
-        rq5 = load_json(rq5_path)
+    if rq5 is not None:
         n_runs = len(rq5.get("runs", []))
         print(f"\nRQ5: {n_runs} runs available")
-        rq5_reproducibility_chart(rq5, out)
-        rq5_category_variance(rq5, out)
+        digest = cache.digest(rq5_path)
+        cache.plot(rq5_reproducibility_chart, rq5, digest, "rq5_reproducibility.png")
+        cache.plot(rq5_category_variance, rq5, digest, "rq5_category_variance.png")
     else:
         print("\n⚠ rq5_reproducibility.json not found, skipping RQ5 plots")
 
+    print(f"\nRendering {len(cache.pending)} plots...")
+    cache.run(args.jobs)
+    cache.save()
     print(f"\n✅ Done! {len(list(out.glob('*.png')))} plots saved to {out}/")
 
 
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+
+from nyuctf_multiagent.backends import MODELS_BY_BACKEND, response_cache
+from nyuctf_multiagent.backends.backend import Backend, BackendResponse, Role
+from nyuctf_multiagent.config import ExperimentConfig
+from nyuctf_multiagent.conversation import Message, MessageRole
+
+# Any configured model, the backend below never reaches a provider
+BACKEND_NAME, (MODEL, *_) = next(iter(MODELS_BY_BACKEND.items()))
+
+
+class CountingBackend(Backend):
+    """Answers every request with the number of messages, counting the calls that reach the model"""
+    NAME = BACKEND_NAME
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.formatted = 0
+
+    def _format_messages(self, messages):
+        return self._format_each(messages, self._format_message)
+
+    def _format_message(self, m):
+        self.formatted += 1
+        return {"role": m.role.value, "content": m.content}
+
+    def _call_model(self, request):
+        self.calls += 1
+        return request
+
+    def _parse_response(self, response):
+        return BackendResponse(content=str(len(response)), cost=1.0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+
+
+def make_backend(temperature, cache_sampled=False):
+    experiment = ExperimentConfig(max_cost=1.0, enable_autoprompt=False, cache_enabled=True,
+                                  cache_sampled=cache_sampled)
+    executor = SimpleNamespace(temperature=temperature, top_p=1.0, max_tokens=1024)
+    config = SimpleNamespace(experiment=experiment, executor=executor)
+    return CountingBackend(Role.EXECUTOR, MODEL, {}, config)
+
+
+def conversation(*contents):
+    return [Message(index=0, role=MessageRole.USER, content=c) for c in contents]
+
+
+def test_deterministic_role_is_cached():
+    backend = make_backend(temperature=0)
+    messages = conversation("hello")
+    assert backend.send(messages).cost == 1.0
+    assert backend.send(messages).cost == 0
+    assert backend.calls == 1
+
+
+def test_sampled_role_bypasses_cache():
+    backend = make_backend(temperature=0.7)
+    assert backend.cache is None
+    messages = conversation("hello")
+    backend.send(messages)
+    backend.send(messages)
+    assert backend.calls == 2
+
+
+def test_sampled_role_is_cached_when_enabled():
+    backend = make_backend(temperature=0.7, cache_sampled=True)
+    messages = conversation("hello")
+    backend.send(messages)
+    backend.send(messages)
+    assert backend.calls == 1
+
+
+def contents(request):
+    return [m["content"] for m in request]
+
+
+def test_only_new_messages_are_formatted():
+    backend = make_backend(temperature=0)
+    messages = conversation("a", "b")
+    backend._format_messages(messages)
+    messages.append(Message(index=1, role=MessageRole.USER, content="c"))
+    assert contents(backend._format_messages(messages)) == ["a", "b", "c"]
+    assert backend.formatted == 3
+
+
+def test_replaced_message_is_formatted_again():
+    backend = make_backend(temperature=0)
+    messages = conversation("a", "b")
+    backend._format_messages(messages)
+    # e.g. a truncated observation: same position, new message
+    messages[1] = Message(index=0, role=MessageRole.USER, content="b truncated")
+    assert contents(backend._format_messages(messages)) == ["a", "b truncated"]
+    assert backend.formatted == 3
+
+
+def test_dropped_message_reuses_the_others():
+    backend = make_backend(temperature=0)
+    messages = conversation("a", "b", "c")
+    backend._format_messages(messages)
+    assert contents(backend._format_messages([messages[0], messages[2]])) == ["a", "c"]
+    assert backend.formatted == 3
+
+
+def test_reset_format_cache_after_in_place_edit():
+    backend = make_backend(temperature=0)
+    messages = conversation("a", "b")
+    backend._format_messages(messages)
+    object.__setattr__(messages[1], "content", "edited")
+    assert contents(backend._format_messages(messages)) == ["a", "b"]
+    backend.reset_format_cache()
+    assert contents(backend._format_messages(messages)) == ["a", "edited"]
@@ -0,0 +1,36 @@
+import runpy
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "challengeRunner" / "filterFinishedChallenges.py"
+parseChallengeLog = runpy.run_path(str(SCRIPT))["parseChallengeLog"]
+
+
+def filter_log(tmp_path, lines):
+    """Run parseChallengeLog over a finished log and return the names it wrote."""
+    input_file, output_file = tmp_path / "finished.txt", tmp_path / "rerun.txt"
+    input_file.write_text("\n".join(lines) + "\n")
+    if not parseChallengeLog(str(input_file), str(output_file)):
+        return set()
+    return set(output_file.read_text().split())
+
+
+def test_failed_challenge_is_written(tmp_path):
+    assert filter_log(tmp_path, [
+        "2019q-cry-chal_1 - FAILED TO RUN",
+        "2019q-cry-chal_2 - solved",
+    ]) == {"2019q-cry-chal_1"}
+
+
+def test_successful_rerun_drops_failed_challenge(tmp_path):
+    assert filter_log(tmp_path, [
+        "2019q-cry-chal_1 - EXCEPTION",
+        "2019q-cry-chal_1 - solved",
+    ]) == set()
+
+
+def test_rerun_of_a_longer_name_does_not_drop_failed_challenge(tmp_path):
+    # Names are compared exactly: chal_1 was matched as a substring of chal_10 before
+    assert filter_log(tmp_path, [
+        "2019q-cry-chal_1 - FAILED TO RUN",
+        "2019q-cry-chal_10 - solved",
+    ]) == {"2019q-cry-chal_1"}
@@ -0,0 +1,50 @@
+import shutil
+
+import pytest
+
+from nyuctf_multiagent.tools.lookup import DEFAULT_CSV_PATH, LookupCommandTool, _load_csv, _suggest
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    # A copy, so the parsed pickle is not written next to the repository's CSV
+    path = tmp_path_factory.mktemp("lookup") / DEFAULT_CSV_PATH.name
+    shutil.copy(DEFAULT_CSV_PATH, path)
+    return str(path)
+
+
+def substring_suggestions(commands, command):
+    """The suggestions lookup_command made before the n-gram index and the BK-tree"""
+    return [cmd for cmd in commands.keys() if command in cmd or cmd in command]
+
+
+def queries(commands):
+    for cmd in commands:
+        yield cmd[:3]
+        yield cmd[1:-1]
+        yield cmd + "x"
+    yield from ("a", "py", "sql", "zzzz", "hash", "nmapscan")
+
+
+def test_substring_suggestions_come_first_in_csv_order(csv_path):
+    commands = _load_csv(csv_path)
+    assert commands
+    for command in queries(commands):
+        expected = substring_suggestions(commands, command)
+        suggestions = _suggest(csv_path, command)
+        assert suggestions[:len(expected)] == expected, command
+        assert len(set(suggestions)) == len(suggestions), command
+
+
+def test_typos_are_suggested_after_substring_matches(csv_path):
+    assert "nmap" in _load_csv(csv_path)
+    assert _suggest(csv_path, "nmpa")[0] == "nmap"
+    # Too short for typos, every name is a couple of edits away
+    assert _suggest(csv_path, "qz") == substring_suggestions(_load_csv(csv_path), "qz")
+
+
+def test_lookup_miss_suggests_five_names(csv_path):
+    result = LookupCommandTool(csv_path=csv_path).call(command="nmpa")
+    assert result["error"] == "Command 'nmpa' not found."
+    assert result["suggestions"].startswith("Did you mean: nmap")
+    assert result["suggestions"].count(",") <= 4
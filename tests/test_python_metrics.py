@@ -0,0 +1,43 @@
+import json
+import runpy
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "challengeRunner" / "PythonMetrics.py"
+LOG_DIR = Path("logs_dcipher/jupyter/kali_generic/jupyter/default")
+
+
+def run_metrics(tmp_path, monkeypatch, runs):
+    """Run PythonMetrics over (file name, exit_reason) logs and return its globals."""
+    log_dir = tmp_path / LOG_DIR
+    log_dir.mkdir(parents=True)
+    for name, exit_reason in runs:
+        (log_dir / name).write_text(json.dumps({"exit_reason": exit_reason, "time_taken": 120.0, "total_cost": 1.0}))
+    monkeypatch.chdir(tmp_path)
+    return runpy.run_path(str(SCRIPT))
+
+
+def test_solved_duplicate_is_counted_once(tmp_path, monkeypatch):
+    # The original script added a duplicate of a solved run to the stats a second time
+    result = run_metrics(tmp_path, monkeypatch, [
+        ("2019q-cry-chal_1-1.json", "solved"),
+        ("2019q-cry-chal_1-2.json", "solved"),
+        ("2019q-cry-chal_2-1.json", "solved"),
+        ("2019q-cry-chal_2-2.json", "giveup"),
+    ])
+    assert result["totalCount"] == 2
+    assert result["regCount"] == 2
+    assert result["solvedCount"] == 2
+    assert result["unsolvedCount"] == 0
+    assert result["categoryDictionary"]["cry"].count == 2
+
+
+def test_solved_duplicate_replaces_unsolved_run(tmp_path, monkeypatch):
+    result = run_metrics(tmp_path, monkeypatch, [
+        ("2019q-pwn-chal_1-1.json", "giveup"),
+        ("2019q-pwn-chal_1-2.json", "solved"),
+    ])
+    stats = result["categoryDictionary"]["pwn"]
+    assert result["solvedCount"] == 1
+    assert stats.count == 1
+    assert stats.exit_reasons["solved"] == 1
+    assert stats.exit_reasons["giveup"] == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from nyuctf_multiagent.backends import response_cache
+from nyuctf_multiagent.backends.backend import BackendResponse
+from nyuctf_multiagent.backends.response_cache import ResponseCache
+from nyuctf_multiagent.tools import ToolCall
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl=60)
+    cache.put("key", BackendResponse(content="answer", cost=0.5))
+    clock.now += 59
+    assert cache.get("key").content == "answer"
+    clock.now += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_hit_is_free_and_has_its_own_tool_call(clock):
+    cache = ResponseCache(ttl=60)
+    stored = BackendResponse(tool_call=ToolCall("run_command", id="call_1", arguments="{}"), cost=0.5)
+    cache.put("key", stored)
+    hit = cache.get("key")
+    assert hit.cost == 0
+    assert hit.tool_call is not stored.tool_call
+    hit.tool_call.parsed_arguments = {"command": "ls"}
+    assert cache.get("key").tool_call.parsed_arguments is None
+
+
+def test_persistent_entry_expires_after_ttl(clock, tmp_path):
+    path = tmp_path / "responses.db"
+    ResponseCache(ttl=60, path=path).put("key", BackendResponse(content="answer"))
+    clock.now += 30
+    assert ResponseCache(ttl=60, path=path).get("key").content == "answer"
+    clock.now += 31
+    assert ResponseCache(ttl=60, path=path).get("key") is None
@@ -0,0 +1,70 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nyuctf_multiagent.backends import semantic_cache
+from nyuctf_multiagent.backends.backend import BackendResponse
+from nyuctf_multiagent.backends.semantic_cache import SemanticCache
+from nyuctf_multiagent.tools import ToolCall
+
+SCOPE = ("backend", "model", (), None, 0, 1.0, 1024)
+
+
+class FakeEncoder:
+    """Stands in for SentenceTransformer: normalized letter counts, so equal texts have similarity 1"""
+    def __init__(self, model_name):
+        pass
+
+    def encode(self, text, normalize_embeddings=True):
+        counts = np.zeros(26)
+        for c in text.lower():
+            if "a" <= c <= "z":
+                counts[ord(c) - ord("a")] += 1
+        return counts / np.linalg.norm(counts)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(semantic_cache, "np", np, raising=False)
+    monkeypatch.setattr(semantic_cache, "SentenceTransformer", FakeEncoder)
+    return SemanticCache(threshold=0.99)
+
+
+def request(*turns, task="solve the crypto challenge"):
+    return [{"role": "system", "content": "you are a ctf player"}, {"role": "user", "content": task},
+            *({"role": "assistant", "content": t} for t in turns)]
+
+
+def answer(cache, req, call_id="call_cached"):
+    key, cached = cache.lookup(SCOPE, req)
+    assert cached is None
+    cache.put(key, BackendResponse(tool_call=ToolCall("run_command", id=call_id, arguments="{}"), cost=0.5))
+
+
+def test_same_turn_hits_with_a_fresh_tool_call_id(cache):
+    answer(cache, request("list the files"))
+    _, first = cache.lookup(SCOPE, request("list the files"))
+    _, second = cache.lookup(SCOPE, request("list the files"))
+    assert first.cost == 0
+    assert first.tool_call.name == "run_command"
+    ids = {first.tool_call.id, second.tool_call.id, "call_cached"}
+    assert len(ids) == 3
+
+
+def test_other_turn_of_the_conversation_misses(cache):
+    answer(cache, request("list the files", "read the flag"))
+    # Same latest turns, one turn further into the conversation
+    _, cached = cache.lookup(SCOPE, request("run it", "list the files", "read the flag"))
+    assert cached is None
+
+
+def test_other_conversation_misses(cache):
+    answer(cache, request("list the files", "read the flag"))
+    _, cached = cache.lookup(SCOPE, request("list the files", "read the flag", task="solve the pwn challenge"))
+    assert cached is None
+
+
+def test_other_backend_scope_misses(cache):
+    answer(cache, request("list the files"))
+    _, cached = cache.lookup(SCOPE[:-1] + (2048,), request("list the files"))
+    assert cached is None